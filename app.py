@@ -1,22 +1,36 @@
 # File: app.py
 
 """
-Main application file. Imports and updates the central data stores.
+Main application file. Starts the background metrics sampler and serves the pages.
 """
 import dash
-from dash import html, dcc, Input, Output
+from dash import html
 import dash_bootstrap_components as dbc
+import logging
 import os
-import psutil
-from datetime import datetime
+import sys
+import plotly.io as pio
 
-# --- Import from the new shared data file ---
-from shared_data import cpu_data, ram_data, net_data, last_net_io, last_net_time
+log = logging.getLogger(__name__)
+
+# --- JSON Serialization ---
+# Dash encodes every layout and callback response through plotly.io's JSON engine.
+# orjson is several times faster than the stdlib encoder and serializes NumPy arrays natively.
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    log.warning("orjson not installed; Dash responses will use the slower stdlib JSON encoder.")
+    pio.json.config.default_engine = "json"
+
+# --- Start the background metrics sampler (fills the stores in shared_data.py) ---
+import sampler  # noqa: F401
 
 # Initialize the Dash App
 app = dash.Dash(
     __name__, 
     use_pages=True, 
+    pages_folder="",  # Pages are registered explicitly below instead of scanning pages/.
     suppress_callback_exceptions=True,
     external_stylesheets=[dbc.themes.MINTY], 
     assets_folder='assets'
@@ -24,43 +38,24 @@ app = dash.Dash(
 server = app.server
 app.title = "BreatheEasy"
 
+# --- Bind the shared callback cache (see cache.py) before the pages use it ---
+from cache import cache  # noqa: E402
+cache.init_app(server)
+
+# --- Register Pages ---
+# Each module calls dash.register_page() on import. New pages must be added here.
+from pages import dashboard, performance  # noqa: E402,F401
+
+# Folder scanning is what normally copies each module's `layout` into the page
+# registry; with explicit imports it has to be done here.
+for _page in dash.page_registry.values():
+    _page.setdefault('layout', sys.modules[_page['module']].layout)
+
 # Main App Layout
 app.layout = html.Div([
-    dash.page_container,
-    dcc.Interval(id='background-data-interval', interval=500),
-    html.Div(id='dummy-output', style={'display': 'none'})
+    dash.page_container
 ])
 
-# Background data collection callback
-@app.callback(
-    Output('dummy-output', 'children'),
-    Input('background-data-interval', 'n_intervals')
-)
-def update_background_data(n):
-    # This now needs to be a mutable global, which is fine for deques
-    global last_net_io, last_net_time
-    
-    now = datetime.now()
-    cpu_percent = psutil.cpu_percent()
-    ram_percent = psutil.virtual_memory().percent
-    
-    current_net_io = psutil.net_io_counters()
-    time_delta = (now - last_net_time).total_seconds()
-    if time_delta > 0:
-        net_in_rate = (current_net_io.bytes_recv - last_net_io.bytes_recv) / time_delta / 1024
-        net_out_rate = (current_net_io.bytes_sent - last_net_io.bytes_sent) / time_delta / 1024
-    else:
-        net_in_rate, net_out_rate = 0, 0
-    
-    last_net_io = current_net_io
-    last_net_time = now
-    
-    cpu_data.append((now, cpu_percent))
-    ram_data.append((now, ram_percent))
-    net_data.append((now, net_in_rate, net_out_rate))
-    
-    return ""
-
 # Run the Application
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 8050))
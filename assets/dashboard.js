@@ -0,0 +1,92 @@
+// File: assets/dashboard.js
+
+/*
+ * Clientside callbacks for the main dashboard (pages/dashboard.py).
+ *
+ * Dash loads every script in assets/ automatically. Functions registered here
+ * run in the browser, so purely presentational updates need no server round trip.
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    dashboard: {
+        /*
+         * Fills in the current-AQI gauge from the data in 'aqi-data-store'.
+         * The value arc path and stroke width come from pages/dashboard.py
+         * (_GAUGE_PATHS, GAUGE_STROKE_WIDTH).
+         */
+        renderAqiGauge: function (data) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!data) {
+                return [{display: 'none'}, noUpdate, noUpdate, noUpdate, noUpdate, noUpdate, noUpdate];
+            }
+
+            return [
+                {},
+                data.city,
+                data.arc,
+                {stroke: data.color, strokeWidth: data.stroke_width},
+                String(data.aqi),
+                data.level,
+                `Last Updated: ${data.time}`
+            ];
+        },
+
+        /*
+         * Fills in the current-weather widget from the data in 'weather-data-store'.
+         * Without readings ('error' set, or no city yet) only the placeholders are shown.
+         */
+        renderWeather: function (data) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!data) {
+                return Array(13).fill(noUpdate);
+            }
+            const show = (value) => (value === undefined || value === null ? '-' : value);
+
+            if (!('temp_c' in data)) {
+                const hasError = Boolean(data.error);
+                return [
+                    '', 'Weather icon placeholder', {display: 'none'},
+                    data.city,
+                    '-°C',
+                    hasError ? data.error : 'Condition N/A',
+                    hasError ? {fontStyle: 'normal', color: '#CC0000'} : {},
+                    'Humidity: - %',
+                    'Wind: - kph',
+                    {display: 'none'}, '', '', ''
+                ];
+            }
+
+            return [
+                data.icon_url,
+                data.condition !== 'Not available' ? data.condition : 'Weather icon',
+                {display: data.icon_url ? 'block' : 'none'},
+                data.city,
+                `${show(data.temp_c)}°C`,
+                data.condition,
+                {},
+                `Humidity: ${show(data.humidity)} %`,
+                `Wind: ${show(data.wind_kph)} kph ${data.wind_dir || ''}`,
+                {display: 'contents'},
+                `Feels like: ${show(data.feelslike_c)}°C`,
+                `Pressure: ${show(data.pressure_mb)} mb`,
+                `UV Index: ${show(data.uv_index)}`
+            ];
+        },
+
+        /*
+         * Restyles the historical trend graph for a theme change by patching
+         * only its template and line color. Styles come from 'trend-theme-styles'.
+         */
+        patchTrendTheme: function (theme, styles, figure) {
+            if (!styles || !figure) {
+                return window.dash_clientside.no_update;
+            }
+            const key = theme === 'dark' ? 'dark' : 'light';
+            const patch = new window.dash_clientside.Patch();
+            patch.assign(['layout', 'template'], styles.templates[key]);
+            if (figure.data && figure.data.length) {
+                patch.assign(['data', 0, 'line', 'color'], styles.line_colors[key]);
+            }
+            return patch.build();
+        }
+    }
+});
@@ -0,0 +1,61 @@
+# File: cache.py
+
+"""
+Shared caching for page callbacks.
+
+- `cache`: Flask-Caching instance for memoizing slow backend calls. It is
+  created unbound here so page modules can decorate functions at import
+  time; `app.py` binds it to the Flask server with `cache.init_app()`.
+- `background_callback_manager`: Dash background-callback manager for slow
+  callbacks (model inference), which run in worker processes and whose
+  results are cached on disk.
+
+Both use filesystem backends so all worker processes share the same entries.
+"""
+import os
+import tempfile
+from datetime import date
+
+import diskcache
+from dash import DiskcacheManager
+from flask_caching import Cache
+
+CACHE_CONFIG = {
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': os.environ.get("BREATHEEASY_CACHE_DIR",
+                                os.path.join(tempfile.gettempdir(), "breatheeasy-cache")),
+    'CACHE_DEFAULT_TIMEOUT': 600,
+}
+
+cache = Cache(config=CACHE_CONFIG)
+
+BACKGROUND_CACHE_DIR = os.environ.get("BREATHEEASY_BACKGROUND_CACHE_DIR",
+                                      os.path.join(tempfile.gettempdir(), "breatheeasy-callbacks"))
+BACKGROUND_CACHE_EXPIRE = 600
+
+# Results are keyed by the callback inputs plus today's date (forecasts are
+# per day) and expire after BACKGROUND_CACHE_EXPIRE seconds.
+background_callback_manager = DiskcacheManager(
+    diskcache.Cache(BACKGROUND_CACHE_DIR),
+    cache_by=[lambda: date.today().isoformat()],
+    expire=BACKGROUND_CACHE_EXPIRE,
+)
+
+
+def is_cacheable(result):
+    """
+    Response filter for `cache.memoize`: skips empty results and error payloads.
+
+    Backend helpers report failures by returning dicts with an 'error' or
+    'error_message' key (or empty frames/lists) instead of raising; caching
+    those would pin an outage in place for the whole timeout.
+    """
+    if result is None:
+        return False
+    if isinstance(result, dict):
+        return 'error' not in result and 'error_message' not in result
+    if hasattr(result, 'empty'):
+        return not result.empty
+    if isinstance(result, (list, tuple)):
+        return len(result) > 0
+    return True
@@ -5,11 +5,12 @@
 Handles loading the project's YAML configuration and setting up centralized logging.
 
 This module is intended to be one of the first imports in the application.
-Upon import, it performs the following sequence:
-1.  Determines the project's root directory.
-2.  Loads the main `config/config.yaml` file into a dictionary.
-3.  Configures the root logger based on settings in the loaded config.
-4.  Provides a globally accessible `CONFIG` dictionary for other modules to use.
+Upon import, it determines the project's root directory. On the first call to
+`get_config()` (or an explicit `initialize_config()`), it:
+1.  Loads the main `config/config.yaml` file into a dictionary.
+2.  Configures the root logger based on settings in the loaded config.
+3.  Provides a globally accessible `CONFIG` dictionary for other modules to use.
+    `CONFIG` is served lazily, so importing it also triggers the first load.
 
 Includes fallback mechanisms for safe execution if the config file is missing
 or logging setup fails.
@@ -20,22 +21,40 @@ import os
 import logging
 import logging.handlers 
 import sys 
-from functools import lru_cache 
+import threading
+import glob
+import hashlib
+import pickle
+import tempfile
+import queue
+import atexit
+import time
+import re
+
+# --- Prefer the libyaml C parser when PyYAML was built with it ---
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 # --- Determine Project Root ---
 
-try:
-    SCRIPT_DIR = os.path.dirname(__file__)
-    PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, '..'))
-except NameError:
-    PROJECT_ROOT = os.path.abspath('.')
-    if not os.path.exists(os.path.join(PROJECT_ROOT, 'src')):
-         alt_root = os.path.abspath(os.path.join(PROJECT_ROOT, '..'))
-         if os.path.exists(os.path.join(alt_root, 'src')):
-             PROJECT_ROOT = alt_root
-         else:
-              logging.basicConfig(level=logging.WARNING)
-              logging.warning(f"ConfigLoader: Could not reliably determine project root from CWD: {PROJECT_ROOT}")
+def _detect_root():
+    """Locates the project root from this file's location, falling back to the CWD."""
+    try:
+        return os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    except NameError:
+        root = os.path.abspath('.')
+        if not os.path.exists(os.path.join(root, 'src')):
+             alt_root = os.path.abspath(os.path.join(root, '..'))
+             if os.path.exists(os.path.join(alt_root, 'src')):
+                 return alt_root
+             logging.basicConfig(level=logging.WARNING)
+             logging.warning(f"ConfigLoader: Could not reliably determine project root from CWD: {root}")
+        return root
+
+# Deployments (e.g. containers) can set BREATHEEASY_ROOT to skip detection entirely.
+PROJECT_ROOT = os.environ.get("BREATHEEASY_ROOT") or _detect_root()
 
 # --- Define Global Config Path ---
 CONFIG_FILE_NAME = 'config.yaml'
@@ -58,15 +77,73 @@ except ImportError as e_imp:
      class ConfigFileNotFoundError(FileNotFoundError): pass
      class ConfigError(Exception): pass
 
+if SafeLoader is yaml.SafeLoader:
+    logging.getLogger(__name__).warning(
+        "ConfigLoader: PyYAML was built without libyaml; falling back to the slower pure-Python parser.")
+
+
+# Parsed configs keyed by path -> (stat signature, config dict).
+_CONFIG_CACHE = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+
+def _pickle_cache_path(config_path, digest):
+    """Returns the path of the pickled-config cache for a given content digest."""
+    return f"{config_path}.{digest}.pkl"
+
+
+def _load_pickled_config(config_path, digest):
+    """
+    Loads a previously pickled config matching the YAML's content digest.
+
+    Returns:
+        dict | None: The cached config, or None if no usable cache exists.
+    """
+    try:
+        with open(_pickle_cache_path(config_path, digest), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Ignoring unreadable config cache for {config_path}: {e}")
+        return None
+
+
+def _store_pickled_config(config_path, digest, config):
+    """
+    Atomically writes the parsed config next to the YAML and removes stale caches.
+
+    Failures (e.g. a read-only config directory) are logged and otherwise ignored.
+    """
+    cache_path = _pickle_cache_path(config_path, digest)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(config_path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        for stale in glob.glob(f"{glob.escape(config_path)}.*.pkl"):
+            if stale != cache_path:
+                os.unlink(stale)
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"Could not write config cache for {config_path}: {e}")
 
 
-@lru_cache()
 def load_config(config_path=CONFIG_PATH):
     """
     Loads the configuration from the YAML file, caching the result.
 
-    Uses functools.lru_cache to ensure the file is read from disk only once,
-    improving performance on subsequent calls.
+    The parsed config is cached per path together with the file's
+    (mtime_ns, size, inode) signature. Each call costs a single `os.stat`;
+    the file is only re-read when it has changed on disk. Across process
+    restarts, a pickled copy stored as `config.yaml.<digest>.pkl` (keyed by
+    a hash of the YAML content) is loaded instead of re-parsing the YAML.
+
+    The returned dictionary is shared between callers and must be treated
+    as read-only.
 
     Args:
         config_path (str): The full path to the configuration YAML file.
@@ -79,27 +156,208 @@ def load_config(config_path=CONFIG_PATH):
         ConfigError: If the file cannot be parsed or another loading error occurs.
     """
     log = logging.getLogger(__name__)
-    log.info(f"Attempting to load configuration from: {config_path}")
-    if not os.path.exists(config_path):
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError as e:
         msg = f"Configuration file not found at: {config_path}"
         log.error(msg)
-        raise ConfigFileNotFoundError(msg)
-    try:
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-        if config is None:
-             log.warning(f"Configuration file is empty: {config_path}")
-             return {}
-        log.info("Configuration loaded successfully.")
+        raise ConfigFileNotFoundError(msg) from e
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _CONFIG_CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(config_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        log.info(f"Attempting to load configuration from: {config_path}")
+        try:
+            with open(config_path, 'rb') as f:
+                raw = f.read()
+            digest = hashlib.blake2b(raw, digest_size=8).hexdigest()
+            config = _load_pickled_config(config_path, digest)
+            if config is None:
+                config = yaml.load(raw, Loader=SafeLoader)
+                if config is None:
+                     log.warning(f"Configuration file is empty: {config_path}")
+                     config = {}
+                _store_pickled_config(config_path, digest, config)
+            log.info("Configuration loaded successfully.")
+        except FileNotFoundError as e:
+            msg = f"Configuration file not found at: {config_path}"
+            log.error(msg)
+            raise ConfigFileNotFoundError(msg) from e
+        except yaml.YAMLError as e:
+            msg = f"Error parsing YAML configuration file: {config_path}. Error: {e}"
+            log.error(msg, exc_info=True)
+            raise ConfigError(msg) from e
+        except Exception as e:
+            msg = f"An unexpected error occurred loading configuration: {e}"
+            log.error(msg, exc_info=True)
+            raise ConfigError(msg) from e
+
+        _CONFIG_CACHE[config_path] = (signature, config)
         return config
-    except yaml.YAMLError as e:
-        msg = f"Error parsing YAML configuration file: {config_path}. Error: {e}"
-        log.error(msg, exc_info=True)
-        raise ConfigError(msg) from e
-    except Exception as e:
-        msg = f"An unexpected error occurred loading configuration: {e}"
-        log.error(msg, exc_info=True)
-        raise ConfigError(msg) from e
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    A RotatingFileHandler that batches writes instead of flushing every record.
+
+    The stream is opened with a large write buffer and flushed only every
+    `flush_every` records, after `flush_interval` seconds, or immediately for
+    records at `flush_level` or above so errors are visible straight away.
+    Closing the handler (including at interpreter shutdown) flushes the rest.
+    """
+
+    def __init__(self, filename, flush_every=50, flush_interval=30.0, flush_level=logging.WARNING,
+                 buffer_size=64 * 1024, **kwargs):
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self.buffer_size = buffer_size
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._deferring = False
+        self._stream_size = 0
+        self._last_msg_len = 0
+        super().__init__(filename, **kwargs)
+
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                      encoding=self.encoding, errors=self.errors)
+        self._stream_size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def shouldRollover(self, record):
+        # The base class seeks the stream to measure it, which flushes the buffer;
+        # track the written size (in encoded bytes, like st_size) instead.
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = self.format(record) + self.terminator
+            self._last_msg_len = len(msg.encode(self.encoding or 'utf-8', self.errors or 'strict'))
+            return self._stream_size + self._last_msg_len >= self.maxBytes
+        return False
+
+    def emit(self, record):
+        # StreamHandler.emit flushes after every write; defer that until a batch is ready.
+        self._deferring = True
+        try:
+            super().emit(record)
+        finally:
+            self._deferring = False
+        self._stream_size += self._last_msg_len
+        self._pending += 1
+        if (record.levelno >= self.flush_level or self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        if self._deferring:
+            return
+        super().flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+
+# A %-style field such as "%(levelname)-8s" or "%(msecs)03d".
+_LOG_FIELD_RE = re.compile(r'%\((\w+)\)([-0]?)(\d*)([sd])|%%')
+
+
+class CompiledFormatter(logging.Formatter):
+    """
+    A logging.Formatter that compiles simple %-style formats into a function.
+
+    Formats that only use `%(name)s` / `%(name)d` fields (with optional `-`/`0`
+    flag and width) are translated once into an equivalent f-string, so
+    formatting a record is a single function call. Anything else falls back to
+    the standard `logging.Formatter` behaviour.
+
+    `%(asctime)s` is rendered from a per-second cache, so bursts of records
+    within the same second share one `strftime` call.
+    """
+
+    def __init__(self, fmt=None, datefmt=None, style='%', **kwargs):
+        super().__init__(fmt, datefmt, style, **kwargs)
+        self._compiled = self._compile(self._fmt) if style == '%' else None
+        self._time_cache = (None, None, '')  # (whole second, date format, formatted time)
+
+    def formatTime(self, record, datefmt=None):
+        datefmt = datefmt or self.default_time_format
+        second = int(record.created)
+        cached_second, cached_fmt, cached_str = self._time_cache
+        if second != cached_second or datefmt is not cached_fmt:
+            cached_str = time.strftime(datefmt, self.converter(second))
+            self._time_cache = (second, datefmt, cached_str)
+        if datefmt is self.default_time_format and self.default_msec_format:
+            return self.default_msec_format % (cached_str, record.msecs)
+        return cached_str
+
+    @staticmethod
+    def _compile(fmt):
+        parts = []
+        pos = 0
+        for match in _LOG_FIELD_RE.finditer(fmt):
+            literal = fmt[pos:match.start()]
+            if '%' in literal:
+                return None
+            parts.append(literal.replace('{', '{{').replace('}', '}}'))
+            pos = match.end()
+            if match.group(0) == '%%':
+                parts.append('%')
+                continue
+            name, flag, width, conversion = match.groups()
+            align = ('<' if flag == '-' else '>') if width else ''
+            if conversion == 's':
+                parts.append(f"{{record.{name}!s:{align}{width}}}")
+            else:
+                zero = '0' if flag == '0' else ''
+                parts.append(f"{{int(record.{name}):{align if not zero else ''}{zero}{width}d}}")
+        tail = fmt[pos:]
+        if '%' in tail:
+            return None
+        parts.append(tail.replace('{', '{{').replace('}', '}}'))
+        try:
+            return eval(compile(f"lambda record: f{''.join(parts)!r}", '<log-format>', 'eval'))
+        except SyntaxError:
+            return None
+
+    def formatMessage(self, record):
+        if self._compiled is not None:
+            try:
+                return self._compiled(record)
+            except AttributeError:
+                pass  # Missing custom field; let the standard formatter report it.
+        return super().formatMessage(record)
+
+
+# Background listener that drains queued records to the log file.
+_LOG_LISTENER = None
+
+# Level-name lookup built once (getLevelNamesMapping() needs Python 3.11+).
+_LEVELS = {name.upper(): level for name, level in (
+    logging.getLevelNamesMapping() if hasattr(logging, 'getLevelNamesMapping') else logging._nameToLevel
+).items()}
+
+# Formatter shared by all handlers; rebuilt only when the format string changes.
+_FORMATTER = None
+
+# Settings and root handlers from the last setup_logging() call.
+_LAST_LOG_SIG = None
+_LAST_LOG_HANDLERS = []
+
+
+def _stop_log_listener():
+    """Stops the file-logging listener, flushing queued records and closing its handlers."""
+    global _LOG_LISTENER
+    if _LOG_LISTENER is None:
+        return
+    _LOG_LISTENER.stop()
+    for handler in _LOG_LISTENER.handlers:
+        handler.close()
+    _LOG_LISTENER = None
+
+
+atexit.register(_stop_log_listener)
 
 
 def setup_logging(config):
@@ -109,6 +367,13 @@ def setup_logging(config):
     Reads logging settings from the provided config dict. It first removes any
     pre-existing handlers from the root logger to prevent duplicate logs.
 
+    File logging is asynchronous: the root logger gets a `QueueHandler` and a
+    `QueueListener` thread writes the queued records to the rotating log file,
+    so callers never block on disk I/O. Console logging stays synchronous.
+
+    If the logging settings are unchanged since the last call and its
+    handlers are still installed, the existing setup is kept as-is.
+
     Args:
         config (dict): The loaded configuration dictionary, expecting a 'logging' key.
     """
@@ -122,16 +387,23 @@ def setup_logging(config):
     log_file_level_str = log_cfg.get('log_file_level', 'DEBUG')
     log_console_level_str = log_cfg.get('log_console_level', 'INFO')
 
-    root_log_level = getattr(logging, log_level_str.upper(), logging.INFO)
-    file_log_level = getattr(logging, log_file_level_str.upper(), logging.DEBUG)
-    console_log_level = getattr(logging, log_console_level_str.upper(), logging.INFO)
+    global _LAST_LOG_SIG, _LAST_LOG_HANDLERS, _LOG_LISTENER, _FORMATTER
+    log_sig = (log_level_str, log_format, log_to_file, log_filename, log_file_level_str, log_console_level_str)
+    root_logger = logging.getLogger()
+    if log_sig == _LAST_LOG_SIG and root_logger.handlers == _LAST_LOG_HANDLERS:
+        return
 
+    root_log_level = _LEVELS.get(log_level_str.upper(), logging.INFO)
+    file_log_level = _LEVELS.get(log_file_level_str.upper(), logging.DEBUG)
+    console_log_level = _LEVELS.get(log_console_level_str.upper(), logging.INFO)
 
-    root_logger = logging.getLogger()
     root_logger.setLevel(min(root_log_level, file_log_level, console_log_level))
 
     for handler in root_logger.handlers[:]: root_logger.removeHandler(handler)
-    formatter = logging.Formatter(log_format)
+    _stop_log_listener()
+    if _FORMATTER is None or _FORMATTER._fmt != log_format:
+        _FORMATTER = CompiledFormatter(log_format)
+    formatter = _FORMATTER
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(console_log_level)
@@ -142,58 +414,120 @@ def setup_logging(config):
     if log_to_file:
         try:
             log_file_path = os.path.join(PROJECT_ROOT, log_filename)
-            file_handler = logging.handlers.RotatingFileHandler(
-                log_file_path, maxBytes=5*1024*1024, backupCount=3, encoding='utf-8')
+            file_handler = BufferedRotatingFileHandler(
+                log_file_path, maxBytes=5*1024*1024, backupCount=3, encoding='utf-8', delay=True)
             file_handler.setLevel(file_log_level)
             file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
+
+            log_queue = queue.Queue(-1)
+            queue_handler = logging.handlers.QueueHandler(log_queue)
+            queue_handler.setLevel(file_log_level)
+            root_logger.addHandler(queue_handler)
+            _LOG_LISTENER = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+            _LOG_LISTENER.start()
             logging.info(f"File logging configured at level: {logging.getLevelName(file_log_level)} to {log_file_path}") 
         except Exception as e:
              logging.error(f"Failed to configure file logging: {e}", exc_info=True)
     else:
          logging.info("File logging is disabled in configuration.")
 
+    _LAST_LOG_SIG = log_sig
+    _LAST_LOG_HANDLERS = root_logger.handlers[:]
 
-# --- Global Initialization: Load config and set up logging on module import ---
-CONFIG = {}
-try:
-    CONFIG = load_config()
-    if CONFIG is not None:
-         setup_logging(CONFIG)
-    else:
-        raise ConfigError("load_config returned None unexpectedly.")
-except (ConfigFileNotFoundError, ConfigError) as e:
-     logging.basicConfig(level=logging.WARNING, format='%(asctime)s [%(levelname)s] %(message)s')
-     logging.critical(f"CRITICAL: Failed to load configuration: {e}. Using fallback logging and empty config.", exc_info=True)
-except Exception as e:
-     logging.basicConfig(level=logging.WARNING, format='%(asctime)s [%(levelname)s] %(message)s')
-     logging.critical(f"CRITICAL: Unexpected error during config/logging setup: {e}", exc_info=True)
+
+# --- Global Initialization: Load config and set up logging on first use ---
+# The one configuration dict, filled in place so every reference to it sees the loaded values.
+_CONFIG = {}
+_initialized = False
+_init_lock = threading.Lock()
+
+
+def initialize_config():
+    """
+    Loads the configuration and configures logging, once per process.
+
+    Called lazily by `get_config()`; call it directly to initialize eagerly
+    (e.g. at application startup). Subsequent calls are no-ops.
+
+    Returns:
+        dict: The loaded configuration dictionary (empty if loading failed).
+    """
+    global _initialized
+    with _init_lock:
+        if _initialized:
+            return _CONFIG
+        try:
+            loaded = load_config()
+            if loaded is not None:
+                 _CONFIG.clear()
+                 _CONFIG.update(loaded)
+                 setup_logging(_CONFIG)
+            else:
+                raise ConfigError("load_config returned None unexpectedly.")
+        except (ConfigFileNotFoundError, ConfigError) as e:
+             _CONFIG.clear()
+             logging.basicConfig(level=logging.WARNING, format='%(asctime)s [%(levelname)s] %(message)s')
+             logging.critical(f"CRITICAL: Failed to load configuration: {e}. Using fallback logging and empty config.", exc_info=True)
+        except Exception as e:
+             logging.basicConfig(level=logging.WARNING, format='%(asctime)s [%(levelname)s] %(message)s')
+             logging.critical(f"CRITICAL: Unexpected error during config/logging setup: {e}", exc_info=True)
+        _initialized = True
+        return _CONFIG
 
 
 def get_config():
     """
     A convenience accessor that returns the globally loaded configuration dictionary.
 
+    The configuration is loaded (and logging configured) on the first call.
+
     Returns:
         dict: The cached configuration dictionary.
     """
-    return CONFIG
+    if not _initialized:
+        return initialize_config()
+    return _CONFIG
+
+
+def __getattr__(name):
+    """Serves `CONFIG` (including `from ... import CONFIG`) as the loaded dict, loading it on first access."""
+    if name == 'CONFIG':
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Tail reads walk the log backwards in blocks and never scan more than this.
+_LOG_TAIL_BLOCK_SIZE = 8192
+_LOG_TAIL_MAX_BYTES = 1024 * 1024
+
 
 def read_last_n_log_lines(n=10):
     """
     Safely reads the last N lines from the application log file.
+
+    Reads the file backwards in fixed-size blocks, so the cost depends on N
+    rather than the size of the log. At most 1 MiB is scanned.
     """
     try:
-        log_cfg = CONFIG.get('logging', {})
+        log_cfg = get_config().get('logging', {})
         log_filename = log_cfg.get('log_filename', 'app.log')
         log_file_path = os.path.join(PROJECT_ROOT, log_filename)
         
         if not os.path.exists(log_file_path):
             return ["Log file not found."]
         
-        with open(log_file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            return lines[-n:]
+        with open(log_file_path, 'rb') as f:
+            pos = f.seek(0, os.SEEK_END)
+            limit = max(0, pos - _LOG_TAIL_MAX_BYTES)
+            buffer = b''
+            while pos > limit and buffer.count(b'\n') <= n:
+                read_size = min(_LOG_TAIL_BLOCK_SIZE, pos - limit)
+                pos -= read_size
+                f.seek(pos)
+                buffer = f.read(read_size) + buffer
+        lines = buffer.decode('utf-8', errors='replace').splitlines(keepends=True)
+        if pos > 0 and lines:
+            lines = lines[1:]  # The first line may have been cut mid-way.
+        return lines[-n:]
     except Exception as e:
         return [f"Error reading log file: {e}"]
 
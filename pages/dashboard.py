@@ -17,23 +17,32 @@ The application is structured as follows:
 
 # --- Core Libraries ---
 import dash
-from dash import dcc, html, callback, Input, Output, State 
+from dash import dcc, html, callback, clientside_callback, ClientsideFunction, Input, Output, State 
 from dash.dependencies import Input, Output, State
 import os
 from dotenv import load_dotenv
 import sys
 import pandas as pd
 import plotly.graph_objects as go
-import traceback
+import plotly.io as pio
+import logging
 import numpy as np
 import math
+import functools
+from datetime import datetime
+from dateutil import parser as dateutil_parser
 import dash_svg
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Setup Project Root Path ---
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from cache import background_callback_manager, cache, is_cacheable
+
+log = logging.getLogger(__name__)
 
 # --- Import Backend Functions & Project Modules ---
 try:
@@ -47,9 +56,8 @@ try:
     from src.modeling.predictor import get_daily_summary_forecast
     from src.exceptions import APIError, ModelFileNotFoundError
 except ImportError as e:
-    print(f"CRITICAL ERROR importing backend modules: {e}")
-    print("Ensure 'src' directory and all its submodules with __init__.py files are present and correct.")
-    traceback.print_exc()
+    log.exception(f"CRITICAL ERROR importing backend modules: {e}")
+    log.error("Ensure 'src' directory and all its submodules with __init__.py files are present and correct.")
 
     def get_current_weather(city_name):
         print(f"Using DUMMY get_current_weather for {city_name}")
@@ -139,6 +147,82 @@ else:
     print("Warning: .env file not found. API calls might fail or use defaults.")
 
 TARGET_CITIES = ['Bangalore', 'Chennai', 'Kolkata', 'Mumbai']
+CITY_OPTIONS = [{'label': city, 'value': city} for city in TARGET_CITIES]
+# API query string per city; also keeps the memoized backend calls' cache keys stable.
+_CITY_QUERY = {city: f"{city}, India" for city in TARGET_CITIES}
+
+def city_query(city):
+    """Returns the "<city>, India" query string used by the AQI and weather APIs."""
+    return _CITY_QUERY.get(city) or f"{city}, India"
+
+# --- Cached Backend Calls ---
+# Live readings change slowly, so a dropdown change within the timeout is served from cache.
+LIVE_CACHE_TIMEOUT = 600
+
+@cache.memoize(timeout=LIVE_CACHE_TIMEOUT, response_filter=is_cacheable)
+def _cached_weather(query_city):
+    return get_current_weather(query_city)
+
+@cache.memoize(timeout=LIVE_CACHE_TIMEOUT, response_filter=is_cacheable)
+def _cached_aqi(query_city):
+    return get_current_aqi_for_city(query_city)
+
+@cache.memoize(timeout=LIVE_CACHE_TIMEOUT, response_filter=is_cacheable)
+def _cached_pollutants(query_city):
+    return get_current_pollutant_risks_for_city(query_city)
+
+@functools.lru_cache(maxsize=8)
+def _daily_series(city):
+    """
+    Returns the city's daily mean AQI as plot-ready NumPy arrays.
+
+    The historical dataset is loaded once per process and never changes, so
+    the resample runs once per city. Theme toggles and repeat selections
+    skip all pandas work.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (datetime64 dates, float32 AQI values);
+            both empty if no data is available.
+    """
+    df_city_raw = get_historical_data_for_city(city)
+    if df_city_raw.empty:
+        return np.array([], dtype='datetime64[ns]'), np.array([], dtype=np.float32)
+    daily = df_city_raw['AQI'].resample('D').mean().dropna()
+    # The resampled index is already datetime64 (whatever unit pandas parsed) and NaN-free;
+    # no coercion or copy needed.
+    return daily.index.to_numpy(), daily.to_numpy(dtype=np.float32)
+
+# --- Concurrent Backend Fetch ---
+# Shared by all requests; each dashboard update submits four network-bound tasks.
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=10, thread_name_prefix="dashboard-fetch")
+
+def fetch_all(city):
+    """
+    Starts every backend lookup for a city concurrently.
+
+    Total latency is that of the slowest lookup instead of the sum of all
+    four. (The model forecast runs separately as a background callback.)
+    Futures are returned rather than results so each widget builder sees
+    its own lookup's exception when calling `.result()`.
+
+    Args:
+        city (str): The selected city name (e.g., "Mumbai").
+
+    Returns:
+        dict: Futures keyed by 'weather', 'aqi', 'history' and 'pollutants'.
+    """
+    query_city = city_query(city)
+
+    def submit(fn, *args):
+        # Each task gets its own copy of the request context so cached calls can reach the app.
+        return _FETCH_EXECUTOR.submit(contextvars.copy_context().run, fn, *args)
+
+    return {
+        'weather': submit(_cached_weather, query_city),
+        'aqi': submit(_cached_aqi, query_city),
+        'history': submit(_daily_series, city),
+        'pollutants': submit(_cached_pollutants, query_city),
+    }
 
 # --- Initialize the Dash App ---
 dash.register_page(
@@ -149,6 +233,110 @@ dash.register_page(
     image='icon_dashboard.png'
 )
 
+# --- Historical Trend Helpers ---
+# Roughly the horizontal pixel width of the historical trend graph.
+TREND_PIXEL_BINS = 1000
+
+# WebGL traces can't resolve CSS variables, so the trend line uses the
+# --accent-primary values from assets/style.css directly.
+TREND_LINE_COLORS = {'light': '#0077B6', 'dark': '#58A6FF'}
+TREND_TEMPLATES = {'light': 'plotly_white', 'dark': 'plotly_dark'}
+
+# Resolved template layouts for the clientside theme patch; plotly.js has no named templates.
+_TREND_THEME_STYLES = {
+    'templates': {theme: {'layout': pio.templates[name].layout.to_plotly_json()}
+                  for theme, name in TREND_TEMPLATES.items()},
+    'line_colors': TREND_LINE_COLORS,
+}
+
+def m4_downsample(x, y, n_bins=TREND_PIXEL_BINS):
+    """
+    Reduces a time series to at most 4 points per horizontal pixel (M4 aggregation).
+
+    For each of `n_bins` equal-width time bins, keeps the first, last, minimum
+    and maximum point. Drawn as a line at `n_bins` pixels wide, the result is
+    indistinguishable from the full series but the payload is O(n_bins).
+
+    Args:
+        x (np.ndarray): Sorted datetime64 x-values.
+        y (np.ndarray): Numeric y-values without NaNs, same length as `x`.
+        n_bins (int): Number of horizontal bins (pixels).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The downsampled x and y arrays.
+    """
+    if len(y) <= 4 * n_bins:
+        return x, y
+
+    xi = x.astype('int64')
+    span = xi[-1] - xi[0]
+    if span <= 0:
+        return x, y
+    bins = ((xi - xi[0]) / span * (n_bins - 1)).astype(np.int64)
+
+    starts = np.flatnonzero(np.diff(bins, prepend=-1))
+    ends = np.append(starts[1:], len(bins)) - 1
+    # Sort by value within each bin; bin boundaries stay put because bins are already sorted.
+    order = np.lexsort((y, bins))
+    keep = np.unique(np.concatenate((starts, ends, order[starts], order[ends])))
+    return x[keep], y[keep]
+
+# --- SVG Gauge Geometry ---
+GAUGE_VIEWBOX_SIZE = 280
+GAUGE_RADIUS = 115
+GAUGE_STROKE_WIDTH = 22
+GAUGE_START_ANGLE_DEG = -225
+GAUGE_SWEEP_DEG = 270
+GAUGE_MAX_AQI = 500
+
+def describe_arc(x, y, radius, start_angle_deg, end_angle_deg):
+    start_rad = math.radians(start_angle_deg)
+    end_rad = math.radians(end_angle_deg)
+    start_x = x + radius * math.cos(start_rad)
+    start_y = y + radius * math.sin(start_rad)
+    end_x = x + radius * math.cos(end_rad)
+    end_y = y + radius * math.sin(end_rad)
+    angle_diff = end_angle_deg - start_angle_deg
+    if angle_diff < 0: angle_diff += 360
+    large_arc_flag = "1" if angle_diff > 180 else "0"
+    sweep_flag = "1"
+    d = f"M {start_x} {start_y} A {radius} {radius} 0 {large_arc_flag} {sweep_flag} {end_x} {end_y}"
+    return d
+
+_GAUGE_CENTER = GAUGE_VIEWBOX_SIZE / 2
+_GAUGE_TRACK_PATH = describe_arc(_GAUGE_CENTER, _GAUGE_CENTER, GAUGE_RADIUS,
+                                 GAUGE_START_ANGLE_DEG, GAUGE_START_ANGLE_DEG + GAUGE_SWEEP_DEG)
+# Value-arc path for every integer AQI on the scale, so no trig runs per update.
+_GAUGE_PATHS = tuple(
+    describe_arc(_GAUGE_CENTER, _GAUGE_CENTER, GAUGE_RADIUS, GAUGE_START_ANGLE_DEG,
+                 GAUGE_START_ANGLE_DEG + (aqi / GAUGE_MAX_AQI) * GAUGE_SWEEP_DEG)
+    for aqi in range(GAUGE_MAX_AQI + 1)
+)
+
+# --- Static Layout Pieces ---
+# Built once at import; none of these depend on the selected city or theme.
+_AQI_SCALE_CARD_STYLES = tuple(
+    {'borderColor': category['color'], 'backgroundColor': f"{category['color']}20"}
+    for category in AQI_SCALE
+)
+
+_AQI_SCALE_CARDS = tuple(
+    html.Div(
+        className="aqi-category-card",
+        style=style,
+        children=[
+            html.Strong(f"{category['level']} ", className="aqi-category-level"),
+            html.Span(f"({category['range']})", className="aqi-category-range"),
+            html.P(category['implications'], className="aqi-category-implications")
+        ]
+    ) for category, style in zip(AQI_SCALE, _AQI_SCALE_CARD_STYLES)
+)
+
+_FOOTER = html.Div(className="page-footer", children=[
+    html.P("Project Team: Arnav Vaidya, Chirag P Patil, Kimaya Anand | School: Delhi Public School Bangalore South"),
+    html.P("Copyright © 2025 BreatheEasy Project Team. Licensed under Apache License.")
+])
+
 # --- App Layout Definition ---
 layout = html.Div(id='app-container', className="app-shell", children=[
     dcc.Store(id='theme-store', storage_type='local', data='light'),
@@ -167,14 +355,36 @@ layout = html.Div(id='app-container', className="app-shell", children=[
             html.Div(className="city-dropdown-container", children=[
                 dcc.Dropdown(
                     id='city-dropdown',
-                    options=[{'label': city, 'value': city} for city in TARGET_CITIES],
+                    options=CITY_OPTIONS,
                     value=TARGET_CITIES[0],
                     placeholder="Select a city",
                     clearable=False,
                     className="city-dropdown"
                 )
             ]),
-            html.Div(id='current-weather-display', className="current-weather-display")
+            dcc.Store(id='weather-data-store'),
+            # Static weather skeleton; assets/dashboard.js fills it in from weather-data-store.
+            html.Div(id='current-weather-display', className="current-weather-display", children=[
+                html.Div(className="weather-icon-container", children=[
+                    html.Img(id='weather-icon', src="", alt="Weather icon placeholder", className="weather-icon",
+                             style={'display': 'none'})
+                ]),
+                html.Div(className="weather-text-info-expanded", children=[
+                    html.P("Select a city", id='weather-city', className="weather-city"),
+                    html.P("-°C", id='weather-temp', className="weather-temp"),
+                    html.P("Condition N/A", id='weather-condition', className="weather-condition"),
+                    html.Div(className="weather-details-row", children=[
+                        html.P("Humidity: - %", id='weather-humidity', className="weather-details"),
+                        html.P("Wind: - kph", id='weather-wind', className="weather-details"),
+                        # Only shown once real readings are available.
+                        html.Div(id='weather-extra-details', style={'display': 'none'}, children=[
+                            html.P(id='weather-feelslike', className="weather-details"),
+                            html.P(id='weather-pressure', className="weather-details"),
+                            html.P(id='weather-uv', className="weather-details")
+                        ])
+                    ])
+                ])
+            ])
         ]),
 
         # 3. Main Content Grid for all widgets
@@ -182,6 +392,7 @@ layout = html.Div(id='app-container', className="app-shell", children=[
             # --- Row 1 ---
             html.Div(className="widget-card", id="section-1-hist-summary", children=[
                 html.H3("Historical Summary"),
+                dcc.Store(id='trend-theme-styles', data=_TREND_THEME_STYLES),
                 dcc.Graph(
                     id='historical-aqi-trend-graph',
                     figure={},
@@ -191,7 +402,25 @@ layout = html.Div(id='app-container', className="app-shell", children=[
             ]),
             html.Div(className="widget-card", id="section-3-curr-aqi", children=[
                 html.H3("Current AQI"),
-                html.Div(id='current-aqi-details-content', className='current-aqi-widget-content')
+                dcc.Store(id='aqi-data-store'),
+                html.Div(id='current-aqi-details-content', className='current-aqi-widget-content', children=[
+                    # Static gauge skeleton; assets/dashboard.js fills it in from aqi-data-store.
+                    html.Div(id='aqi-gauge-wrapper', className="aqi-gauge-wrapper", style={'display': 'none'}, children=[
+                        html.H4(id='aqi-gauge-city', className="aqi-city-name-highlight"),
+                        html.Div(className="aqi-gauge-svg-container", children=[
+                            dash_svg.Svg(viewBox=f"0 0 {GAUGE_VIEWBOX_SIZE} {GAUGE_VIEWBOX_SIZE}", className="aqi-svg-gauge", children=[
+                                dash_svg.Path(d=_GAUGE_TRACK_PATH, className="aqi-gauge-track",
+                                              style={'strokeWidth': GAUGE_STROKE_WIDTH}),
+                                dash_svg.Path(id='aqi-gauge-arc', className="aqi-gauge-value",
+                                              style={'strokeWidth': GAUGE_STROKE_WIDTH}),
+                                dash_svg.Text(id='aqi-gauge-value', x="50%", y="44%", dy=".1em", className="aqi-gauge-value-text"),
+                                dash_svg.Text(id='aqi-gauge-level', x="50%", y="64%", dy=".1em", className="aqi-gauge-level-text")
+                            ])
+                        ]),
+                        html.P(id='aqi-gauge-time', className="aqi-obs-time-gauge")
+                    ]),
+                    html.Div(id='aqi-message')
+                ])
             ]),
             html.Div(className="widget-card", id="section-5-pollutant-risks", children=[
                 html.H3("Current Pollutant Risks"),
@@ -208,115 +437,79 @@ layout = html.Div(id='app-container', className="app-shell", children=[
                     ),
                     html.Hr(className="edu-info-separator"),
                     html.H4("AQI Categories (CPCB India)", className="aqi-scale-title"),
-                    html.Div(className="aqi-scale-container", children=[
-                        html.Div(
-                            className="aqi-category-card",
-                            style={'borderColor': category['color'], 'backgroundColor': f"{category['color']}20"},
-                            children=[
-                                html.Strong(f"{category['level']} ", className="aqi-category-level"),
-                                html.Span(f"({category['range']})", className="aqi-category-range"),
-                                html.P(category['implications'], className="aqi-category-implications")
-                            ]
-                        ) for category in AQI_SCALE
-                    ])
+                    html.Div(className="aqi-scale-container", children=_AQI_SCALE_CARDS)
                 ])
             ]),
             html.Div(className="widget-card", id="section-4-aqi-forecast", children=[
                 html.H3("AQI Forecast (Next 3 Days)"),
-                html.Div(id='aqi-forecast-table-content', className='forecast-widget-content')
+                dcc.Loading(type='circle', children=html.Div(id='aqi-forecast-table-content', className='forecast-widget-content'))
             ]),
             html.Div(className="widget-card", id="section-6-weekly-risks", children=[
                 html.H3("Predicted Weekly Risks & Advisories"),
-                html.Div(id='predicted-weekly-risks-content', className='predicted-risks-widget-content'),
+                dcc.Loading(type='circle', children=html.Div(id='predicted-weekly-risks-content', className='predicted-risks-widget-content')),
             ]) 
         ]) 
     ]), 
 
     # 4. Page Footer
-    html.Div(className="page-footer", children=[
-        html.P("Project Team: Arnav Vaidya, Chirag P Patil, Kimaya Anand | School: Delhi Public School Bangalore South"),
-        html.P("Copyright © 2025 BreatheEasy Project Team. Licensed under Apache License.")
-    ]) 
+    _FOOTER
 ])
 
-# --- Callbacks ---
-@callback(
-    Output('current-weather-display', 'children'),
-    [Input('city-dropdown', 'value')]
-)
-def update_current_weather(selected_city):
-    """Fetches and displays the current weather for the selected city."""
-    def get_default_weather_layout(city_name_text="Select a city", error_message=None):
-        condition_display_children = ["Condition N/A"]
-        condition_style = {}
-        if error_message:
-            condition_display_children = [error_message]
-            condition_style = {'font-style': 'normal', 'color': '#CC0000'}
-        return [
-            html.Div(className="weather-icon-container", children=[
-                html.Img(src="", alt="Weather icon placeholder", className="weather-icon")
-            ]),
-            html.Div(className="weather-text-info-expanded", children=[
-                html.P(city_name_text, className="weather-city"),
-                html.P("-°C", className="weather-temp"),
-                html.P(condition_display_children, className="weather-condition", style=condition_style),
-                html.Div(className="weather-details-row", children=[
-                    html.P("Humidity: - %", className="weather-details"),
-                    html.P("Wind: - kph", className="weather-details")
-                ])
-            ])
-        ]
+# --- Widget Builders ---
+# Each builder renders one widget from a pending `fetch_all` result and handles its own errors.
+def update_current_weather(selected_city, pending_weather):
+    """
+    Fetches the current weather for the selected city as data for 'weather-data-store'.
+
+    The widget itself is a static skeleton in the layout, filled in by a
+    clientside callback, so only this small dict crosses the wire.
 
+    Returns:
+        dict: On success the display values ('city', 'temp_c', 'condition',
+            'icon_url', 'humidity', 'wind_kph', 'wind_dir', 'feelslike_c',
+            'pressure_mb', 'uv_index'); otherwise 'city' and an 'error' message
+            (None when no city is selected).
+    """
     if not selected_city:
-        return get_default_weather_layout()
+        return {'city': "Select a city", 'error': None}
 
     try:
-        query_city_for_api = f"{selected_city}, India"
-        weather_data = get_current_weather(query_city_for_api)
+        weather_data = pending_weather.result()
 
         if weather_data and isinstance(weather_data, dict) and 'temp_c' in weather_data:
             icon_url_path = weather_data.get('condition_icon')
             condition_text = weather_data.get('condition_text', "Not available")
             icon_url = "https:" + icon_url_path if icon_url_path and icon_url_path.startswith("//") else (icon_url_path or "")
             if not condition_text or str(condition_text).strip() == "": condition_text = "Not available"
-            return [
-                html.Div(className="weather-icon-container", children=[
-                    html.Img(src=icon_url, alt=condition_text if condition_text != "Not available" else "Weather icon",
-                             className="weather-icon", style={'display': 'block' if icon_url else 'none'})]),
-                html.Div(className="weather-text-info-expanded", children=[
-                    html.P(f"{selected_city}", className="weather-city"),
-                    html.P(f"{weather_data.get('temp_c', '-')}°C", className="weather-temp"),
-                    html.P(f"{condition_text}", className="weather-condition"),
-                    html.Div(className="weather-details-row", children=[
-                        html.P(f"Humidity: {weather_data.get('humidity', '-')} %", className="weather-details"),
-                        html.P(f"Wind: {weather_data.get('wind_kph', '-')} kph {weather_data.get('wind_dir', '')}", className="weather-details"),
-                        html.P(f"Feels like: {weather_data.get('feelslike_c', '-')}°C", className="weather-details"),
-                        html.P(f"Pressure: {weather_data.get('pressure_mb', '-')} mb", className="weather-details"),
-                        html.P(f"UV Index: {weather_data.get('uv_index', '-')}", className="weather-details"),])])]
+            return {
+                'city': selected_city,
+                'temp_c': weather_data.get('temp_c'),
+                'condition': condition_text,
+                'icon_url': icon_url,
+                'humidity': weather_data.get('humidity'),
+                'wind_kph': weather_data.get('wind_kph'),
+                'wind_dir': weather_data.get('wind_dir', ''),
+                'feelslike_c': weather_data.get('feelslike_c'),
+                'pressure_mb': weather_data.get('pressure_mb'),
+                'uv_index': weather_data.get('uv_index'),
+            }
         else:
             error_msg = "Weather data not available"
             if weather_data and isinstance(weather_data, dict):
                 if weather_data.get("error_message"): error_msg = weather_data.get("error_message")
                 elif weather_data.get("error"):
                     error_detail = weather_data.get("error"); error_msg = error_detail.get("message", "Unknown API error") if isinstance(error_detail, dict) else str(error_detail)
-            return get_default_weather_layout(city_name_text=selected_city, error_message=error_msg)
+            return {'city': selected_city, 'error': error_msg}
     except APIError as e:
-        print(f"Handled APIError for {selected_city}: {e}")     
-        return get_default_weather_layout(city_name_text=selected_city, error_message="Weather service unavailable.")
+        log.warning(f"Handled APIError for {selected_city}: {e}")
+        return {'city': selected_city, 'error': "Weather service unavailable."}
     except Exception as e:
-        print(f"General error fetching weather for {selected_city}: {e}")
-        traceback.print_exc()
-        return get_default_weather_layout(city_name_text=selected_city, error_message="Error loading weather.")
+        log.exception(f"General error fetching weather for {selected_city}: {e}")
+        return {'city': selected_city, 'error': "Error loading weather."}
 
-@callback(
-    Output('historical-aqi-trend-graph', 'figure'),
-    Input('city-dropdown', 'value'),
-    Input('theme-store', 'data') 
-)
-def update_historical_trend_graph(selected_city, current_theme):
+def update_historical_trend_graph(selected_city, current_theme, pending_series):
     """
-    Generates the historical AQI trend graph from the final daily feature dataset,
-    with robust data processing.
+    Generates the historical AQI trend graph from the final daily feature dataset.
     """
     def create_placeholder_figure(message_text):
         fig = go.Figure()
@@ -331,36 +524,22 @@ def update_historical_trend_graph(selected_city, current_theme):
         return create_placeholder_figure("Select a city to view historical AQI trend.")
 
     try:
-        # Step 1: Get the data using our new function
-        df_city_raw = get_historical_data_for_city(selected_city)
-        if df_city_raw.empty:
+        # Daily-resampled dates and values as NumPy arrays (cached per city)
+        dates, daily_aqi = pending_series.result()
+        if len(daily_aqi) == 0:
             return create_placeholder_figure(f"No historical data available for {selected_city}.")
 
-        # Step 2: Resample the data to daily, similar to the new logic
-        daily_aqi_series = df_city_raw['AQI'].resample('D').mean().dropna()
-
-        # Step 3: Apply the ROBUST processing from your OLD working code
-        df_trend = daily_aqi_series.reset_index()
-        df_trend.columns = ['Date', 'AQI'] 
-
-        df_trend['Date'] = pd.to_datetime(df_trend['Date'], errors='coerce')
-        df_trend['AQI'] = pd.to_numeric(df_trend['AQI'], errors='coerce')
-        df_trend.dropna(subset=['Date', 'AQI'], inplace=True)
-        
-        if df_trend.empty:
-            return create_placeholder_figure(f"No valid data to plot for {selected_city}.")
+        # Keep NumPy arrays (no .tolist()) and send at most ~4 points per pixel to the browser.
+        x_values_for_plot, y_values_for_plot = m4_downsample(dates, daily_aqi)
 
-        x_values_for_plot = df_trend['Date'].tolist()
-        y_values_for_plot = df_trend['AQI'].tolist()
-        
         fig = go.Figure(data=[
-            go.Scatter(
+            go.Scattergl(
                 x=x_values_for_plot, y=y_values_for_plot, mode='lines', name='Daily Mean AQI',
-                line=dict(color='var(--accent-primary)') 
+                line=dict(color=TREND_LINE_COLORS.get(current_theme, TREND_LINE_COLORS['light']))
             )
         ])
 
-        graph_template = 'plotly_dark' if current_theme == 'dark' else 'plotly_white'
+        graph_template = TREND_TEMPLATES.get(current_theme, TREND_TEMPLATES['light'])
         
         fig.update_layout(
             title_text=f"Historical Daily Mean AQI for {selected_city}", title_x=0.5,
@@ -373,38 +552,35 @@ def update_historical_trend_graph(selected_city, current_theme):
         return fig
         
     except Exception as e:
-        print(f"ERROR IN HISTORICAL TREND CALLBACK for {selected_city}: {e}")
-        traceback.print_exc()
+        log.exception(f"Error in historical trend builder for {selected_city}: {e}")
         return create_placeholder_figure(f"Error displaying trend for {selected_city}.")
 
-# --- SVG Gauge Helper Function ---
-def describe_arc(x, y, radius, start_angle_deg, end_angle_deg):
-    start_rad = math.radians(start_angle_deg)
-    end_rad = math.radians(end_angle_deg)
-    start_x = x + radius * math.cos(start_rad)
-    start_y = y + radius * math.sin(start_rad)
-    end_x = x + radius * math.cos(end_rad)
-    end_y = y + radius * math.sin(end_rad)
-    angle_diff = end_angle_deg - start_angle_deg
-    if angle_diff < 0: angle_diff += 360
-    large_arc_flag = "1" if angle_diff > 180 else "0"
-    sweep_flag = "1"
-    d = f"M {start_x} {start_y} A {radius} {radius} 0 {large_arc_flag} {sweep_flag} {end_x} {end_y}"
-    return d
+# AQICN reports observation times as local "YYYY-MM-DD HH:MM:SS" strings.
+AQICN_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+OBS_TIME_DISPLAY_FORMAT = '%I:%M %p, %b %d'
 
-@callback(
-    Output('current-aqi-details-content', 'children'),
-    [Input('city-dropdown', 'value')]
-)
-def update_current_aqi_details(selected_city): 
-    """Fetches the current AQI and renders the SVG gauge for the selected city."""
+def _parse_obs_time(obs_time_str):
+    """Parses an observation time, trying the AQICN format before general parsing."""
+    try:
+        return datetime.strptime(obs_time_str, AQICN_TIME_FORMAT)
+    except ValueError:
+        return dateutil_parser.parse(obs_time_str)
+
+def update_current_aqi_details(selected_city, pending_aqi):
+    """
+    Prepares the current AQI for the SVG gauge, which is drawn in the browser.
+
+    Returns:
+        tuple: (gauge data for 'aqi-data-store' or None, children for 'aqi-message').
+            Exactly one of the two is populated.
+    """
     if not selected_city:
-        return html.P("Select a city to view current AQI.", style={'textAlign': 'center', 'marginTop': '20px'})
+        return None, html.P("Select a city to view current AQI.", style={'textAlign': 'center', 'marginTop': '20px'})
 
-    query_city_for_api = f"{selected_city}, India" 
+    query_city_for_api = city_query(selected_city)
     
     try:
-        aqi_data = get_current_aqi_for_city(query_city_for_api)
+        aqi_data = pending_aqi.result()
 
         if not aqi_data or aqi_data.get('aqi') is None or 'error' in aqi_data:
             error_message = "Data unavailable" 
@@ -413,7 +589,7 @@ def update_current_aqi_details(selected_city):
             if isinstance(aqi_data, dict) and aqi_data.get('station') == "Unknown station" and "not found" in error_message.lower():
                  error_message = f"No AQI monitoring station found for {selected_city} via AQICN."
             
-            return html.Div([
+            return None, html.Div([
                 html.P(f"Could not retrieve AQI for {selected_city}.", className="aqi-error-message"),
                 html.P(error_message, className="aqi-error-detail")
             ], className="current-aqi-error-container")
@@ -428,68 +604,71 @@ def update_current_aqi_details(selected_city):
         formatted_time = obs_time_str
         if obs_time_str and isinstance(obs_time_str, str) and obs_time_str != 'N/A':
             try:
-                dt_obj = pd.to_datetime(obs_time_str) 
-                formatted_time = dt_obj.strftime('%I:%M %p, %b %d')
-            except ValueError:
+                formatted_time = _parse_obs_time(obs_time_str).strftime(OBS_TIME_DISPLAY_FORMAT)
+            except (ValueError, OverflowError):
                 if len(obs_time_str) > 30: formatted_time = "Time N/A" 
                 else: formatted_time = obs_time_str
         elif hasattr(obs_time_str, 'strftime'):
-             formatted_time = obs_time_str.strftime('%I:%M %p, %b %d')
+             formatted_time = obs_time_str.strftime(OBS_TIME_DISPLAY_FORMAT)
         else:
             formatted_time = str(obs_time_str) if obs_time_str != 'N/A' else "Time N/A"
-
-        max_aqi_on_scale = 500.0
-        current_aqi_clamped = max(0, min(float(aqi_value), max_aqi_on_scale)) 
-        percentage = current_aqi_clamped / max_aqi_on_scale
-        
-        gauge_start_angle_deg = -225 
-        gauge_total_sweep_deg = 270 
-        value_end_angle_deg = gauge_start_angle_deg + (percentage * gauge_total_sweep_deg)
-
-        viewbox_size = 280 
-        center_xy = viewbox_size / 2
-        radius = 115   
-        stroke_width = 22 
-
-        background_arc_path = describe_arc(center_xy, center_xy, radius, gauge_start_angle_deg, gauge_start_angle_deg + gauge_total_sweep_deg)
-        foreground_arc_path = describe_arc(center_xy, center_xy, radius, gauge_start_angle_deg, value_end_angle_deg)
-        
-        return html.Div(className="aqi-gauge-wrapper", children=[
-            html.H4(selected_city, className="aqi-city-name-highlight"),
-            html.Div(className="aqi-gauge-svg-container", children=[
-                dash_svg.Svg(viewBox=f"0 0 {viewbox_size} {viewbox_size}", className="aqi-svg-gauge", children=[
-                    dash_svg.Path(d=background_arc_path, className="aqi-gauge-track", style={'strokeWidth': stroke_width}),
-                    dash_svg.Path(d=foreground_arc_path, className="aqi-gauge-value", 
-                                  style={'stroke': aqi_color, 'strokeWidth': stroke_width}),
-                    dash_svg.Text(f"{aqi_value}", x="50%", y="44%", dy=".1em", className="aqi-gauge-value-text"), 
-                    dash_svg.Text(aqi_level, x="50%", y="64%", dy=".1em", className="aqi-gauge-level-text")  
-                ])
-            ]),
-            html.P(f"Last Updated: {formatted_time}", className="aqi-obs-time-gauge")
-        ])
+        if aqi_data.get('stale'):
+            formatted_time = f"{formatted_time} (cached)"
+
+        current_aqi_clamped = max(0, min(float(aqi_value), GAUGE_MAX_AQI))
+        gauge_data = {
+            'city': selected_city,
+            'aqi': aqi_value,
+            'arc': _GAUGE_PATHS[int(current_aqi_clamped)],
+            'level': aqi_level,
+            'color': aqi_color,
+            'stroke_width': GAUGE_STROKE_WIDTH,
+            'time': formatted_time,
+        }
+        return gauge_data, None
 
     except APIError as e:
-        print(f"APIError fetching current AQI for {query_city_for_api}: {e}") 
-        return html.Div(className="current-aqi-error-container", children=[
+        log.warning(f"APIError fetching current AQI for {query_city_for_api}: {e}")
+        return None, html.Div(className="current-aqi-error-container", children=[
             html.P(f"Service error retrieving AQI for {selected_city}.", className="aqi-error-message")
         ])
     except Exception as e:
-        print(f"General error updating current AQI for {query_city_for_api}: {e}") 
-        traceback.print_exc()
-        return html.Div(className="current-aqi-error-container", children=[
+        log.exception(f"General error updating current AQI for {query_city_for_api}: {e}")
+        return None, html.Div(className="current-aqi-error-container", children=[
             html.P(f"Error loading AQI data for {selected_city}.", className="aqi-error-message")
         ])
 
 # --- Section 4 & 6: Unified AQI Forecast and Predicted Risks ---
+# (Section 4 style, Section 6 style) per category color; prefilled for the AQI scale.
+_CARD_STYLE_CACHE = {}
+
+def _forecast_card_styles(color):
+    """Returns the shared (Section 4, Section 6) card style dicts for a category color."""
+    styles = _CARD_STYLE_CACHE.get(color)
+    if styles is None:
+        base = {'borderLeft': f"7px solid {color}", 'borderRadius': '6px', 'backgroundColor': f"{color}1A"}
+        styles = ({**base, 'padding': '12px 15px'}, {**base, 'padding': '10px 15px'})
+        _CARD_STYLE_CACHE[color] = styles
+    return styles
+
+for _category in AQI_SCALE:
+    _forecast_card_styles(_category['color'])
+
 @callback(
     Output('aqi-forecast-table-content', 'children'),
     Output('predicted-weekly-risks-content', 'children'),
-    [Input('city-dropdown', 'value')]
+    Input('city-dropdown', 'value'),
+    background=True,
+    manager=background_callback_manager
 )
 def update_all_forecast_widgets(selected_city):
     """
-    A single, unified callback to generate and display the calibrated forecast
-    in both Section 4 and Section 6, ensuring consistency.
+    Generates the calibrated forecast once and renders it for both Section 4
+    and Section 6, ensuring consistency.
+
+    Runs as a background callback: model inference happens in a worker
+    process, so the rest of the dashboard updates without waiting for it,
+    and repeat selections are served from the manager's disk cache.
     """
     if not selected_city:
         placeholder = html.P("Select a city to view forecast.", style={'textAlign': 'center', 'marginTop': '20px'})
@@ -511,9 +690,9 @@ def update_all_forecast_widgets(selected_city):
             color = day_data.get('color', '#DDDDDD')
             date_str = day_data.get('date', 'N/A')
             implications = day_data.get('implications', 'No specific implications provided.')
-            
+            card_style_sec4, card_style_sec6 = _forecast_card_styles(color)
+
             # Create Card for Section 4 (Simple Forecast)
-            card_style_sec4 = {'borderLeft': f"7px solid {color}", 'padding': '12px 15px', 'borderRadius': '6px', 'backgroundColor': f"{color}1A"}
             forecast_cards_sec4.append(
                 html.Div(style=card_style_sec4, className="forecast-day-card", children=[
                     html.Div(className="forecast-card-header", children=[
@@ -524,7 +703,6 @@ def update_all_forecast_widgets(selected_city):
             )
             
             # Create Card for Section 6 (Detailed Risks)
-            card_style_sec6 = {'borderLeft': f"7px solid {color}", 'padding': '10px 15px', 'borderRadius': '6px', 'backgroundColor': f"{color}1A"}
             risk_cards_sec6.append(
                 html.Div(style=card_style_sec6, className="predicted-risk-day-card", children=[
                     html.Div(className="predicted-risk-header", children=[
@@ -538,25 +716,33 @@ def update_all_forecast_widgets(selected_city):
         return forecast_cards_sec4, risk_cards_sec6
 
     except Exception as e:
-        print(f"Error in unified forecast callback for {selected_city}: {e}")
-        traceback.print_exc()
+        log.exception(f"Error in unified forecast callback for {selected_city}: {e}")
         error_message = html.P("An error occurred while generating the forecast.", className="forecast-error-message")
         return error_message, error_message
 
-@callback(
-    Output('current-pollutant-risks-content', 'children'),
-    [Input('city-dropdown', 'value')]
-)
-def update_pollutant_risks_display(selected_city):
+def _risk_item(risk_statement):
+    """Renders "POLLUTANT: message" as a list item with the pollutant name in bold."""
+    pollutant, separator, message = risk_statement.partition(":")
+    if separator:
+        return html.Li([html.Strong(f"{pollutant}:"), html.Span(message)], className="pollutant-risk-item")
+    return html.Li(risk_statement, className="pollutant-risk-item")
+
+def _format_pollutant_value(value):
+    """Formats a raw pollutant reading: whole floats without decimals, others to one decimal place."""
+    if isinstance(value, float):
+        return f"{value:.1f}" if not value.is_integer() else str(int(value))
+    return str(value)
+
+def update_pollutant_risks_display(selected_city, pending_risks):
     """Fetches current pollutant data and displays interpreted health risks."""
     if not selected_city:
         return html.P("Select a city to view current pollutant risks.", 
                       style={'textAlign': 'center', 'marginTop': '20px'})
 
-    query_city_for_api = f"{selected_city}, India" 
+    query_city_for_api = city_query(selected_city)
 
     try:
-        risks_data = get_current_pollutant_risks_for_city(query_city_for_api)
+        risks_data = pending_risks.result()
 
         if not risks_data or 'error' in risks_data or not risks_data.get('risks'):
             error_message = "Pollutant risk data unavailable."
@@ -569,41 +755,16 @@ def update_pollutant_risks_display(selected_city):
                 html.P(error_message, className="pollutant-risk-error")
             ], style={'textAlign': 'center', 'paddingTop': '30px'})
 
-        risk_items = []
-        if risks_data['risks']: 
-            for risk_statement in risks_data['risks']:
-                parts = risk_statement.split(":", 1)
-                if len(parts) == 2:
-                    pollutant_part = html.Strong(f"{parts[0]}:")
-                    message_part = html.Span(parts[1])
-                    risk_items.append(html.Li([pollutant_part, message_part], className="pollutant-risk-item"))
-                else:
-                    risk_items.append(html.Li(risk_statement, className="pollutant-risk-item"))
-        else: 
-            risk_items.append(html.Li("No significant pollutant risks identified at this time.", className="pollutant-risk-item-none"))
-        
-        raw_pollutants = risks_data.get('pollutants', {})
-        pollutant_details_children = []
-        if raw_pollutants:
-            for pol_code, data_dict in raw_pollutants.items():
-                if isinstance(data_dict, dict) and 'v' in data_dict:
-                    value = data_dict['v']
-                    try:
-                        if isinstance(value, float) and (abs(value - round(value, 2)) > 1e-9 or len(str(value).split('.')[-1]) > 2) : 
-                            display_value = f"{value:.1f}"
-                        elif isinstance(value, float):
-                             display_value = f"{int(value)}" 
-                        else:
-                            display_value = str(value)
-                    except:
-                        display_value = str(value) 
-
-                    pollutant_details_children.append(
-                        html.Div(className="pollutant-pill", children=[
-                            html.Span(f"{pol_code.upper()}: ", className="pollutant-pill-name"), 
-                            html.Span(display_value, className="pollutant-pill-value")
-                        ])
-                    )
+        risk_items = [_risk_item(risk_statement) for risk_statement in risks_data['risks']]
+
+        pollutant_details_children = [
+            html.Div(className="pollutant-pill", children=[
+                html.Span(f"{pol_code.upper()}: ", className="pollutant-pill-name"),
+                html.Span(_format_pollutant_value(data_dict['v']), className="pollutant-pill-value")
+            ])
+            for pol_code, data_dict in (risks_data.get('pollutants') or {}).items()
+            if isinstance(data_dict, dict) and 'v' in data_dict
+        ]
 
         collapsible_content = []
         if pollutant_details_children:
@@ -620,13 +781,82 @@ def update_pollutant_risks_display(selected_city):
         ] + collapsible_content) 
 
     except APIError as e: 
-        print(f"APIError fetching pollutant risks for {query_city_for_api}: {e}")
+        log.warning(f"APIError fetching pollutant risks for {query_city_for_api}: {e}")
         return html.P(f"Service error retrieving pollutant data for {selected_city}.", className="pollutant-risk-error")
     except Exception as e:
-        print(f"General error updating pollutant risks for {query_city_for_api}: {e}")
-        traceback.print_exc()
+        log.exception(f"General error updating pollutant risks for {query_city_for_api}: {e}")
         return html.P(f"Error loading pollutant risk data for {selected_city}.", className="pollutant-risk-error")
 
+# --- Main Dashboard Callback ---
+@callback(
+    Output('weather-data-store', 'data'),
+    Output('historical-aqi-trend-graph', 'figure'),
+    Output('aqi-data-store', 'data'),
+    Output('aqi-message', 'children'),
+    Output('current-pollutant-risks-content', 'children'),
+    Input('city-dropdown', 'value'),
+    State('theme-store', 'data')
+)
+def update_dashboard(selected_city, current_theme):
+    """
+    Updates the live city-dependent widgets in one round trip.
+
+    All backend lookups run concurrently via `fetch_all`; the widgets are
+    then rendered here. The forecast widgets update separately through the
+    background `update_all_forecast_widgets` callback. Each builder handles its own errors, so one failing
+    backend only affects its own widget.
+    """
+    fetched = fetch_all(selected_city) if selected_city else {}
+    gauge_data, aqi_message = update_current_aqi_details(selected_city, fetched.get('aqi'))
+    return (
+        update_current_weather(selected_city, fetched.get('weather')),
+        update_historical_trend_graph(selected_city, current_theme, fetched.get('history')),
+        gauge_data,
+        aqi_message,
+        update_pollutant_risks_display(selected_city, fetched.get('pollutants')),
+    )
+
+# --- Clientside Callbacks (assets/dashboard.js) ---
+clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='renderAqiGauge'),
+    Output('aqi-gauge-wrapper', 'style'),
+    Output('aqi-gauge-city', 'children'),
+    Output('aqi-gauge-arc', 'd'),
+    Output('aqi-gauge-arc', 'style'),
+    Output('aqi-gauge-value', 'children'),
+    Output('aqi-gauge-level', 'children'),
+    Output('aqi-gauge-time', 'children'),
+    Input('aqi-data-store', 'data')
+)
+
+clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='renderWeather'),
+    Output('weather-icon', 'src'),
+    Output('weather-icon', 'alt'),
+    Output('weather-icon', 'style'),
+    Output('weather-city', 'children'),
+    Output('weather-temp', 'children'),
+    Output('weather-condition', 'children'),
+    Output('weather-condition', 'style'),
+    Output('weather-humidity', 'children'),
+    Output('weather-wind', 'children'),
+    Output('weather-extra-details', 'style'),
+    Output('weather-feelslike', 'children'),
+    Output('weather-pressure', 'children'),
+    Output('weather-uv', 'children'),
+    Input('weather-data-store', 'data')
+)
+
+# Theme toggles restyle the trend graph in the browser; the data is unchanged.
+clientside_callback(
+    ClientsideFunction(namespace='dashboard', function_name='patchTrendTheme'),
+    Output('historical-aqi-trend-graph', 'figure', allow_duplicate=True),
+    Input('theme-store', 'data'),
+    State('trend-theme-styles', 'data'),
+    State('historical-aqi-trend-graph', 'figure'),
+    prevent_initial_call=True
+)
+
 # --- THEME TOGGLE CALLBACKS ---
 
 @callback(
@@ -3,14 +3,16 @@
 """
 This file contains the layout and callbacks for the live Performance Hub page.
 """
-from dash import dcc, html, dash_table, Input, Output, callback
+from dash import dcc, html, dash_table, Input, Output, State, callback, no_update
 import dash
-import pandas as pd
+import csv
 import psutil
 import os
 from datetime import datetime, timedelta
+import numpy as np
 import plotly.graph_objects as go
-from shared_data import cpu_data, ram_data, net_data
+from cache import cache
+from shared_data import MAX_DATA_POINTS, metrics
 import dash_bootstrap_components as dbc
 
 # --- Imports and setup ---
@@ -31,6 +33,19 @@ dash.register_page(
 )
 
 APP_PROCESS = psutil.Process(os.getpid())
+APP_PID = str(APP_PROCESS.pid)
+APP_START_TIME = APP_PROCESS.create_time()
+CPU_COUNT = psutil.cpu_count() or 1  # Process CPU % is divided by this to match the system-wide scale.
+
+# Live metrics refresh every FAST_INTERVAL_MS; the tables and the log only every SLOW_INTERVAL_MS.
+FAST_INTERVAL_MS = 500
+SLOW_INTERVAL_MS = 5000
+
+# --- Table Styles ---
+TABLE_STYLE_HEADER = {'backgroundColor': '#0D1117', 'color': '#E6EDF3', 'fontWeight': 'bold', 'borderBottom': '1px solid #58A6FF'}
+TABLE_STYLE_CELL = {'backgroundColor': '#161B22', 'color': '#C9D1D9', 'border': 'none', 'textAlign': 'left', 'padding': '12px', 'whiteSpace': 'normal', 'height': 'auto', 'overflow': 'hidden', 'textOverflow': 'ellipsis', 'maxWidth': 200}
+TABLE_STYLE_DATA = {'borderBottom': '1px solid rgba(255, 255, 255, 0.05)'}
+PROC_COLUMNS = [{"name": "Metric", "id": "Metric"}, {"name": "Value", "id": "Value"}]
 
 # --- Page Layout (Corrected) ---
 layout = html.Div(className="performance-hub-shell", children=[
@@ -57,7 +72,8 @@ layout = html.Div(className="performance-hub-shell", children=[
         html.Div(className="performance-column", children=[
             html.Div(className="widget-card-perf", children=[
                 html.H4("Application Process Details"),
-                html.Div(id='process-details-table-perf')
+                # Built once; the slow callback only replaces its rows.
+                dash_table.DataTable(id='process-details-table-perf', columns=PROC_COLUMNS, data=[], style_as_list_view=True, style_header={'display': 'none'}, style_cell=TABLE_STYLE_CELL, style_data=TABLE_STYLE_DATA, style_cell_conditional=[{'if': {'column_id': 'Value'}, 'fontWeight': 'bold'}])
             ]),
             html.Div(className="widget-card-perf", children=[
                 html.H4("Latest Forecasts Log"),
@@ -87,6 +103,8 @@ layout = html.Div(className="performance-hub-shell", children=[
                         id='performance-time-series-graph',
                         config={'displayModeBar': False},
                     ),
+                    # Which tab the graph shows and how many samples (ring cursor) it already holds.
+                    dcc.Store(id='performance-graph-state'),
                     html.Div(id='graph-readout-container', className="graph-readout-container")
                 ])
             ]),
@@ -99,88 +117,205 @@ layout = html.Div(className="performance-hub-shell", children=[
             ]),
         ]),
     ]),
-    dcc.Interval(id='performance-interval-timer-perf', interval=500, n_intervals=0)
+    dcc.Interval(id='performance-interval-timer-perf', interval=FAST_INTERVAL_MS, n_intervals=0),
+    dcc.Interval(id='performance-slow-interval-timer-perf', interval=SLOW_INTERVAL_MS, n_intervals=0)
 ])
 
-# --- Helper function ---
+# --- Helper functions ---
+
+# Tail reads of the predictions log walk it backwards in blocks of this size.
+_CSV_TAIL_BLOCK_SIZE = 8192
+
+def read_last_n_csv_rows(path, n=5):
+    """
+    Reads the header and the last N rows of a CSV file without parsing the rest.
+
+    The file is read backwards from the end in fixed-size blocks until N full
+    lines are available, so the cost does not grow with the file. Rows must
+    not contain embedded newlines.
+
+    Args:
+        path (str): Path of the CSV file.
+        n (int): Number of trailing rows to return.
+
+    Returns:
+        tuple[list[str], list[dict]]: The column names and the last rows as
+            {column: value} dicts (values are strings), oldest first.
+    """
+    with open(path, 'rb') as f:
+        header_line = f.readline()
+        data_start = f.tell()
+        pos = f.seek(0, os.SEEK_END)
+        buffer = b''
+        while pos > data_start and buffer.count(b'\n') <= n:
+            read_size = min(_CSV_TAIL_BLOCK_SIZE, pos - data_start)
+            pos -= read_size
+            f.seek(pos)
+            buffer = f.read(read_size) + buffer
+    lines = buffer.decode('utf-8', errors='replace').splitlines()
+    if pos > data_start and lines:
+        lines = lines[1:]  # The first line may have been cut mid-way.
+    columns = next(csv.reader([header_line.decode('utf-8-sig', errors='replace')]), [])
+    rows = [dict(zip(columns, values)) for values in csv.reader(line for line in lines[-n:] if line)]
+    return columns, rows
+
+# --- Cached Log Readers (shared by all clients and workers via cache.py) ---
+LOG_CACHE_TIMEOUT = 600
+
+@cache.memoize(timeout=LOG_CACHE_TIMEOUT)
+def _cached_prediction_log_rows(path, mtime_ns, size):
+    """
+    Returns `read_last_n_csv_rows(path, 5)`. The file's mtime and size are part
+    of the cache key, so any change to the log is a cache miss.
+    """
+    return read_last_n_csv_rows(path, 5)
+
+@cache.memoize(timeout=SLOW_INTERVAL_MS // 1000)
+def _cached_app_log(n):
+    """Returns the last `n` application log lines as one string, reused for one slow refresh period."""
+    return "".join(read_last_n_log_lines(n))
+
+def build_prediction_log_table():
+    """
+    Returns the table of the latest logged forecasts, re-reading the log only if it changed on disk.
+    """
+    try:
+        stat = os.stat(PREDICTIONS_LOG_PATH)
+    except OSError:
+        return html.P("No predictions have been logged yet.")
+    try:
+        log_columns, log_rows = _cached_prediction_log_rows(PREDICTIONS_LOG_PATH, stat.st_mtime_ns, stat.st_size)
+    except Exception as e:
+        return html.P(f"Error reading prediction log: {e}")
+    return dash_table.DataTable(columns=[{"name": col, "id": col} for col in log_columns], data=log_rows, style_table={'overflowX': 'auto'}, style_header=TABLE_STYLE_HEADER, style_cell=TABLE_STYLE_CELL, style_data=TABLE_STYLE_DATA)
+
 def create_time_series_figure(x, y, name, color, y_axis_title):
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=list(x), y=list(y), mode='lines', name=name, line=dict(color=color, width=2), fill='tozeroy', fillcolor=f'rgba({int(color[1:3], 16)}, {int(color[3:5], 16)}, {int(color[5:7], 16)}, 0.3)'))
+    fig.add_trace(go.Scatter(x=x, y=y, mode='lines', name=name, line=dict(color=color, width=2), fill='tozeroy', fillcolor=f'rgba({int(color[1:3], 16)}, {int(color[3:5], 16)}, {int(color[5:7], 16)}, 0.3)'))
     fig.update_layout(margin=dict(l=40, r=20, t=10, b=20), plot_bgcolor='#161B22', paper_bgcolor='#161B22', font_color='#E6EDF3', xaxis=dict(showgrid=False), yaxis=dict(title=y_axis_title, gridcolor='rgba(255, 255, 255, 0.1)'), showlegend=False)
     return fig
 
-# --- Main Callback ---
+# Metric fields plotted on each tab, one per trace, in trace order.
+TAB_FIELDS = {
+    'tab-cpu': ('cpu',),
+    'tab-ram': ('ram',),
+    'tab-net': ('net_out', 'net_in'),  # 'Sent' is drawn below the axis, 'Received' above.
+}
+
+def create_tab_figure(active_tab, x, *ys):
+    """Builds the full time-series figure for a tab from its ordered samples."""
+    if active_tab == 'tab-cpu':
+        return create_time_series_figure(x, ys[0], 'CPU', '#58A6FF', 'Usage (%)')
+    if active_tab == 'tab-ram':
+        return create_time_series_figure(x, ys[0], 'Memory', '#3FB950', 'Usage (%)')
+    y_out, y_in = ys
+    figure = go.Figure()
+    figure.add_trace(go.Scatter(x=x, y=-y_out, name='Sent', fill='tozeroy', line_color='#F778BA', hoverinfo='y'))
+    figure.add_trace(go.Scatter(x=x, y=y_in, name='Received', fill='tozeroy', line_color='#3FB950', hoverinfo='y'))
+    figure.update_layout(margin=dict(l=40, r=20, t=10, b=20), plot_bgcolor='#161B22', paper_bgcolor='#161B22', font_color='#E6EDF3', xaxis=dict(showgrid=False), yaxis=dict(title='Rate (KB/s)', gridcolor='rgba(255, 255, 255, 0.1)', zerolinecolor='rgba(255,255,255,0.2)'), showlegend=False)
+    return figure
+
+def create_extend_data(active_tab, x, *ys):
+    """
+    Builds a dcc.Graph `extendData` update that appends the new samples to every trace.
+
+    Plotly drops the oldest points beyond MAX_DATA_POINTS, matching the ring buffer window.
+    """
+    if active_tab == 'tab-net':
+        ys = (-ys[0], ys[1])
+    x_values = np.datetime_as_string(x, unit='ms').tolist()
+    update = {'x': [x_values] * len(ys), 'y': [y.tolist() for y in ys]}
+    return [update, list(range(len(ys))), MAX_DATA_POINTS]
+
+# --- Live Metrics Callback (every FAST_INTERVAL_MS) ---
 @callback(
     Output('performance-time-series-graph', 'figure'),
+    Output('performance-time-series-graph', 'extendData'),
+    Output('performance-graph-state', 'data'),
     Output('graph-readout-container', 'children'),
     Output('cpu-usage-text-perf', 'children'),
     Output('ram-usage-text-perf', 'children'),
     Output('net-in-text-perf', 'children'),
     Output('net-out-text-perf', 'children'),
     Output('uptime-text-perf', 'children'),
-    Output('prediction-log-table-container-perf', 'children'),
-    Output('app-log-container-perf', 'children'),
-    Output('process-details-table-perf', 'children'),
     Input('performance-interval-timer-perf', 'n_intervals'),
-    Input('perf-graph-tabs', 'value')
+    Input('perf-graph-tabs', 'value'),
+    State('performance-graph-state', 'data')
 )
-def update_live_metrics(n_intervals, active_tab):
+def update_live_metrics(n_intervals, active_tab, graph_state):
+    """
+    Refreshes the scorecards and the time-series graph.
+
+    The graph is sent in full only when the tab changes (or on first load);
+    otherwise only the samples recorded since the last update are appended.
+    """
     # --- 1. Get Latest Values from Global Data ---
-    now = datetime.now()
-    latest_cpu = cpu_data[-1][1] if cpu_data else 0
-    latest_ram = ram_data[-1][1] if ram_data else 0
-    latest_net_in = net_data[-1][1] if net_data else 0
-    latest_net_out = net_data[-1][2] if net_data else 0
+    latest = metrics.latest()
+    latest_cpu = latest.cpu if latest else 0
+    latest_ram = latest.ram if latest else 0
+    latest_net_in = latest.net_in if latest else 0
+    latest_net_out = latest.net_out if latest else 0
 
     cpu_output = html.Span([f"{latest_cpu:.1f}", html.Span(" %", className="scorecard-unit")])
     ram_output = html.Span([f"{latest_ram:.1f}", html.Span(" %", className="scorecard-unit")])
     net_in_output = html.Span([f"{latest_net_in:.1f}", html.Span(" KB/s", className="scorecard-unit")])
     net_out_output = html.Span([f"{latest_net_out:.1f}", html.Span(" KB/s", className="scorecard-unit")])
+    uptime_output = str(timedelta(seconds=int(datetime.now().timestamp() - APP_START_TIME)))
+
+    # --- 2. Time-Series Graph: full figure or just the new samples ---
+    fields = TAB_FIELDS.get(active_tab)
+    figure_to_show, extend_data, new_graph_state = no_update, no_update, no_update
+    if fields is None:
+        figure_to_show, new_graph_state = go.Figure(), None
+    elif graph_state and graph_state.get('tab') == active_tab and graph_state.get('cursor', 0) <= metrics.cursor:
+        cursor, x_vals, *y_vals = metrics.series_since(graph_state['cursor'], 'ts', *fields)
+        if len(x_vals):
+            extend_data = create_extend_data(active_tab, x_vals, *y_vals)
+            new_graph_state = {'tab': active_tab, 'cursor': cursor}
+    else:
+        # New tab, first load, or a cursor from another process's buffer: resend everything.
+        cursor, x_vals, *y_vals = metrics.series_since(0, 'ts', *fields)
+        figure_to_show = create_tab_figure(active_tab, x_vals, *y_vals)
+        new_graph_state = {'tab': active_tab, 'cursor': cursor}
 
-    table_style_header = {'backgroundColor': '#0D1117', 'color': '#E6EDF3', 'fontWeight': 'bold', 'borderBottom': '1px solid #58A6FF'}
-    table_style_cell = {'backgroundColor': '#161B22', 'color': '#C9D1D9', 'border': 'none', 'textAlign': 'left', 'padding': '12px', 'whiteSpace': 'normal', 'height': 'auto', 'overflow': 'hidden', 'textOverflow': 'ellipsis', 'maxWidth': 200}
-    try:
-        uptime_delta = timedelta(seconds=int(now.timestamp() - APP_PROCESS.create_time()))
-        uptime_output = str(uptime_delta)
-        process_details = [{"Metric": k, "Value": v} for k, v in {"Process ID (PID)": str(APP_PROCESS.pid), "Status": APP_PROCESS.status(), "CPU % (Process)": f"{APP_PROCESS.cpu_percent() / psutil.cpu_count():.1f} %", "Memory Usage": f"{APP_PROCESS.memory_info().rss / (1024*1024):.1f} MB", "Uptime": uptime_output}.items()]
-        process_table = dash_table.DataTable(columns=[{"name": i, "id": i} for i in process_details[0]], data=process_details, style_as_list_view=True, style_header={'display': 'none'}, style_cell=table_style_cell, style_data={'borderBottom': '1px solid rgba(255, 255, 255, 0.05)'}, style_cell_conditional=[{'if': {'column_id': 'Value'}, 'fontWeight': 'bold'}])
-    except Exception as e:
-        process_table = html.P(f"Could not read process info: {e}")
-        uptime_output = "N/A"
-    try:
-        if os.path.exists(PREDICTIONS_LOG_PATH):
-            log_df = pd.read_csv(PREDICTIONS_LOG_PATH).tail(5)
-            log_table = dash_table.DataTable(columns=[{"name": col, "id": col} for col in log_df.columns], data=log_df.to_dict('records'), style_table={'overflowX': 'auto'}, style_header=table_style_header, style_cell=table_style_cell, style_data={'borderBottom': '1px solid rgba(255, 255, 255, 0.05)'})
-        else:
-            log_table = html.P("No predictions have been logged yet.")
-    except Exception as e:
-        log_table = html.P(f"Error reading prediction log: {e}")
-    log_content = "".join(read_last_n_log_lines(15))
-    
-    figure_to_show = go.Figure()
     readout_to_show = []
-    if active_tab == 'tab-cpu':
-        x_vals, y_vals = zip(*cpu_data) if cpu_data else ([], [])
-        figure_to_show = create_time_series_figure(x_vals, y_vals, 'CPU', '#58A6FF', 'Usage (%)')
-        readout = html.Div([html.Span("Current: ", className="readout-label"), html.Span(f"{latest_cpu:.1f} %", className="readout-value")], className="readout-item")
-        readout_to_show = [readout]
-    elif active_tab == 'tab-ram':
-        x_vals, y_vals = zip(*ram_data) if ram_data else ([], [])
-        figure_to_show = create_time_series_figure(x_vals, y_vals, 'Memory', '#3FB950', 'Usage (%)')
-        readout = html.Div([html.Span("Current: ", className="readout-label"), html.Span(f"{latest_ram:.1f} %", className="readout-value")], className="readout-item")
+    if active_tab in ('tab-cpu', 'tab-ram'):
+        current = latest_cpu if active_tab == 'tab-cpu' else latest_ram
+        readout = html.Div([html.Span("Current: ", className="readout-label"), html.Span(f"{current:.1f} %", className="readout-value")], className="readout-item")
         readout_to_show = [readout]
     elif active_tab == 'tab-net':
-        x_vals = [item[0] for item in net_data]
-        y_in = [item[1] for item in net_data]
-        y_out = [item[2] for item in net_data]
-        y_out_negative = [-val for val in y_out]
-        figure_to_show = go.Figure()
-        figure_to_show.add_trace(go.Scatter(x=x_vals, y=y_out_negative, name='Sent', fill='tozeroy', line_color='#F778BA', hoverinfo='y'))
-        figure_to_show.add_trace(go.Scatter(x=x_vals, y=y_in, name='Received', fill='tozeroy', line_color='#3FB950', hoverinfo='y'))
-        figure_to_show.update_layout(margin=dict(l=40, r=20, t=10, b=20), plot_bgcolor='#161B22', paper_bgcolor='#161B22', font_color='#E6EDF3', xaxis=dict(showgrid=False), yaxis=dict(title='Rate (KB/s)', gridcolor='rgba(255, 255, 255, 0.1)', zerolinecolor='rgba(255,255,255,0.2)'), showlegend=False)
         readout_in = html.Div([html.Span([html.Span(className="readout-color-box", style={'backgroundColor': '#3FB950'}), "Received: "], className="readout-label"), html.Span(f"{latest_net_in:.1f} KB/s", className="readout-value")], className="readout-item")
         readout_out = html.Div([html.Span([html.Span(className="readout-color-box", style={'backgroundColor': '#F778BA'}), "Sent: "], className="readout-label"), html.Span(f"{latest_net_out:.1f} KB/s", className="readout-value")], className="readout-item")
         readout_to_show = [readout_in, readout_out]
 
-    return (figure_to_show, readout_to_show, cpu_output, ram_output, net_in_output, 
-            net_out_output, uptime_output, log_table, log_content, process_table)
\ No newline at end of file
+    return (figure_to_show, extend_data, new_graph_state, readout_to_show, cpu_output, ram_output,
+            net_in_output, net_out_output, uptime_output)
+
+# --- Tables and Log Callback (every SLOW_INTERVAL_MS) ---
+@callback(
+    Output('prediction-log-table-container-perf', 'children'),
+    Output('app-log-container-perf', 'children'),
+    Output('process-details-table-perf', 'data'),
+    Input('performance-slow-interval-timer-perf', 'n_intervals')
+)
+def update_process_and_logs(n_intervals):
+    try:
+        uptime_output = str(timedelta(seconds=int(datetime.now().timestamp() - APP_START_TIME)))
+        # oneshot() reads /proc/<pid> once for all of the accessors below.
+        with APP_PROCESS.oneshot():
+            status = APP_PROCESS.status()
+            cpu_percent = APP_PROCESS.cpu_percent()
+            rss = APP_PROCESS.memory_info().rss
+        process_details = [
+            {"Metric": "Process ID (PID)", "Value": APP_PID},
+            {"Metric": "Status", "Value": status},
+            {"Metric": "CPU % (Process)", "Value": f"{cpu_percent / CPU_COUNT:.1f} %"},
+            {"Metric": "Memory Usage", "Value": f"{rss / (1024*1024):.1f} MB"},
+            {"Metric": "Uptime", "Value": uptime_output},
+        ]
+    except Exception as e:
+        process_details = [{"Metric": "Error", "Value": f"Could not read process info: {e}"}]
+    log_table = build_prediction_log_table()
+    log_content = _cached_app_log(15)
+
+    return log_table, log_content, process_details
\ No newline at end of file
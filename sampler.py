@@ -0,0 +1,161 @@
+# File: sampler.py
+
+"""
+Background system-metrics sampler for the live Performance Hub.
+
+Runs a single daemon thread that polls psutil every `SAMPLE_INTERVAL_SECONDS`
+and writes the readings into the ring buffer in `shared_data.py`. Keeping the polling
+here means Dash callbacks never block on psutil; they only read the latest
+samples.
+
+When the ring buffer is in shared memory, only one process samples at a time:
+each process's thread waits on an exclusive `flock` and the holder (the
+leader) does the polling. If the leader exits, the lock is released and
+another worker takes over.
+
+On Linux, CPU and memory usage are read directly from /proc; elsewhere (or if
+/proc is unreadable) psutil is used.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; every process samples for itself there.
+    fcntl = None
+
+import numpy as np
+import psutil
+
+from shared_data import IS_SHARED, SHM_NAME, Sample, metrics
+
+SAMPLE_INTERVAL_SECONDS = 0.5
+LEADER_LOCK_PATH = os.path.join(tempfile.gettempdir(), f"{SHM_NAME}.leader")
+
+_start_lock = threading.Lock()
+_sampler_thread = None
+_leader_lock_file = None
+
+
+def _wait_for_leadership():
+    """Blocks until this process may write to the shared ring buffer."""
+    global _leader_lock_file
+    if not IS_SHARED:
+        return
+    if fcntl is not None:
+        _leader_lock_file = open(LEADER_LOCK_PATH, 'a')
+        fcntl.flock(_leader_lock_file, fcntl.LOCK_EX)  # Held (via the open file) until the process exits.
+    metrics.claim_writer()  # Also resets a buffer left by an earlier run.
+
+
+class _ProcStatReader:
+    """
+    Reads system CPU and memory usage straight from /proc (Linux only).
+
+    Keeps /proc/stat and /proc/meminfo open and re-reads them with `os.pread`
+    each tick, parsing only the fields needed. Mirrors psutil's definitions:
+    CPU% is the non-idle share of jiffies since the last read, and RAM% is
+    (MemTotal - MemAvailable) / MemTotal.
+    """
+
+    def __init__(self):
+        self._stat_fd = os.open('/proc/stat', os.O_RDONLY)
+        self._meminfo_fd = os.open('/proc/meminfo', os.O_RDONLY)
+        self._last_busy, self._last_total = self._cpu_times()
+        self.ram_percent()  # Fail now, not in the loop, if the format is unexpected.
+
+    def _cpu_times(self):
+        # First line: "cpu  user nice system idle iowait irq softirq steal guest guest_nice"
+        fields = os.pread(self._stat_fd, 512, 0).split(b'\n', 1)[0].split()[1:9]
+        times = [int(v) for v in fields]
+        total = sum(times)
+        return total - times[3] - times[4], total
+
+    def cpu_percent(self):
+        busy, total = self._cpu_times()
+        busy_delta, total_delta = busy - self._last_busy, total - self._last_total
+        self._last_busy, self._last_total = busy, total
+        return 100.0 * busy_delta / total_delta if total_delta > 0 else 0.0
+
+    def ram_percent(self):
+        mem_total = mem_available = None
+        for line in os.pread(self._meminfo_fd, 1024, 0).splitlines():
+            if line.startswith(b'MemTotal:'):
+                mem_total = int(line.split()[1])
+            elif line.startswith(b'MemAvailable:'):
+                mem_available = int(line.split()[1])
+                break
+        return 100.0 * (mem_total - mem_available) / mem_total
+
+
+def _make_proc_reader():
+    """Returns a `_ProcStatReader`, or None to fall back to psutil."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        return _ProcStatReader()
+    except (OSError, ValueError, TypeError, IndexError):
+        return None
+
+
+def _loop():
+    """Samples CPU, RAM and network rates until the process exits."""
+    _wait_for_leadership()
+    proc_reader = _make_proc_reader()
+    if proc_reader is not None:
+        read_cpu, read_ram = proc_reader.cpu_percent, proc_reader.ram_percent
+    else:
+        psutil.cpu_percent(interval=None)  # Prime the counter; the first call always returns 0.0.
+        read_cpu = lambda: psutil.cpu_percent(interval=None)
+        read_ram = lambda: psutil.virtual_memory().percent
+    last_net_io = psutil.net_io_counters()
+    last_net_ns = time.monotonic_ns()
+    next_tick = time.monotonic()
+
+    while True:
+        next_tick += SAMPLE_INTERVAL_SECONDS
+        time.sleep(max(0.0, next_tick - time.monotonic()))
+
+        now = datetime.now()  # Wall-clock label for the charts only.
+        now_ns = time.monotonic_ns()
+        cpu_percent = read_cpu()
+        ram_percent = read_ram()
+        current_net_io = psutil.net_io_counters()
+
+        elapsed_ns = now_ns - last_net_ns
+        if elapsed_ns > 0:
+            # Bytes per nanosecond -> KB per second, one float division per rate.
+            scale = 1e9 / 1024 / elapsed_ns
+            net_in_rate = (current_net_io.bytes_recv - last_net_io.bytes_recv) * scale
+            net_out_rate = (current_net_io.bytes_sent - last_net_io.bytes_sent) * scale
+        else:
+            net_in_rate, net_out_rate = 0, 0
+
+        last_net_io = current_net_io
+        last_net_ns = now_ns
+
+        metrics.append(Sample(np.datetime64(now, 'ms'), cpu_percent, ram_percent, net_in_rate, net_out_rate))
+
+
+def start_sampler():
+    """
+    Starts the background sampler thread if it is not already running.
+
+    Safe to call more than once; only the first call spawns the thread.
+
+    Returns:
+        threading.Thread: The running sampler thread.
+    """
+    global _sampler_thread
+    with _start_lock:
+        if _sampler_thread is None or not _sampler_thread.is_alive():
+            _sampler_thread = threading.Thread(target=_loop, name="metrics-sampler", daemon=True)
+            _sampler_thread.start()
+    return _sampler_thread
+
+
+start_sampler()
@@ -1,18 +1,29 @@
 # File: scripts/Catogorical_Encoding.py
 
+import numpy as np
 import pandas as pd
 
+from csv_cache import read_csv_cached
+
 # --- Configuration ---
 file_path = "/Users/apple/Personal_Files/Codes/AQI_Prediction_Project/Data/Post-Processing/CSV_Files/Master_AQI_Dataset.csv"
 
 # --- Data Loading and Processing ---
-df = pd.read_csv(file_path)
-df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%y').dt.strftime('%d/%m/%Y')
-df_encoded = pd.get_dummies(df, columns=['City'], drop_first=False)
-bool_cols = df_encoded.select_dtypes(include='bool').columns
-df_encoded[bool_cols] = df_encoded[bool_cols].astype(int)
+df = read_csv_cached(file_path)
+# cache=True parses each distinct date string once; the DD/MM/YYYY output format is applied by to_csv.
+df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%y', cache=True)
+
+# One-hot encode City straight into an int8 matrix (one column per city, 0/1 values).
+# Rows with a missing city (code -1) stay all zeros, as with pd.get_dummies.
+city_cat = pd.Categorical(df['City'])
+codes = city_cat.codes
+rows = np.flatnonzero(codes >= 0)
+one_hot = np.zeros((len(df), len(city_cat.categories)), dtype=np.int8)
+one_hot[rows, codes[rows]] = 1
+one_hot_df = pd.DataFrame(one_hot, columns=[f'City_{c}' for c in city_cat.categories], index=df.index)
+df_encoded = pd.concat([df.drop(columns=['City']), one_hot_df], axis=1)
 
 # --- Save Output ---
 output_file = "Encoded_AQI_Dataset.csv"
-df_encoded.to_csv(output_file, index=False)
+df_encoded.to_csv(output_file, index=False, date_format='%d/%m/%Y')
 print(f"Encoded dataset saved as {output_file} with Date format DD/MM/YYYY and categorical values as 0/1.")
\ No newline at end of file
@@ -3,6 +3,7 @@
 """
 This script builds the final, feature-rich DAILY dataset for model training.
 """
+import numpy as np
 import pandas as pd
 import os
 import sys
@@ -12,12 +13,15 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from csv_cache import AQI_DTYPES, DAILY_DATE_FORMAT, HAS_PYARROW, HOURLY_DATE_FORMAT, WEATHER_DTYPES, parquet_cache_path
+
 # --- Configuration ---
 AQI_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "Post-Processing", "CSV_Files", "city_day.csv")
 WEATHER_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "Post-Processing", "CSV_Files", "Master_Dataset_V2.csv")
 OUTPUT_FILE_PATH = os.path.join(PROJECT_ROOT, "data", "Post-Processing", "CSV_Files", "Master_Daily_Features.csv")
 
 TARGET_CITIES = ['Bangalore', 'Chennai', 'Kolkata', 'Mumbai']
+WEATHER_SUMMARY_COLS = ['temperature_2m', 'relative_humidity_2m', 'precipitation', 'wind_speed_10m']
 TARGET_STATIONS = {
     "Bangalore": {"lat": 12.9152, "lon": 77.6103},
     "Chennai":   {"lat": 13.16,   "lon": 80.26},
@@ -25,13 +29,35 @@ TARGET_STATIONS = {
     "Mumbai":    {"lat": 19.08,   "lon": 72.88}
 }
 
+def lag_within_groups(values, group_codes, periods):
+    """
+    Shifts `values` down by `periods` rows without crossing group boundaries.
+
+    Equivalent to `groupby(...).shift(periods)` when rows are sorted by group,
+    which makes every group a contiguous run of equal codes.
+
+    Args:
+        values (np.ndarray): Values to lag, sorted by group.
+        group_codes (np.ndarray): Integer group code of each row.
+        periods (int): Number of rows to shift by.
+
+    Returns:
+        np.ndarray: float32 lagged values, NaN where no earlier row of the same group exists.
+    """
+    lagged = np.full(len(values), np.nan, dtype=np.float32)
+    if periods < len(values):
+        lagged[periods:] = values[:-periods]
+        lagged[periods:][group_codes[periods:] != group_codes[:-periods]] = np.nan
+    return lagged
+
 def create_daily_features(aqi_path, weather_path, output_path):
     print("--- Starting Daily Feature Engineering ---")
     
     # --- Step 1: Load and Prepare Daily AQI Data ---
     print(f"Loading daily AQI data from: {aqi_path}")
     try:
-        aqi_df = pd.read_csv(aqi_path, parse_dates=['Datetime'])
+        aqi_df = pd.read_csv(aqi_path, usecols=['City', 'Datetime', 'AQI'], dtype=AQI_DTYPES,
+                             parse_dates=['Datetime'], date_format=DAILY_DATE_FORMAT)
         aqi_df.rename(columns={'Datetime': 'Date'}, inplace=True)
         
         aqi_df = aqi_df[aqi_df['City'].isin(TARGET_CITIES)].copy()
@@ -44,19 +70,22 @@ def create_daily_features(aqi_path, weather_path, output_path):
     # --- Step 2: Load and Summarize Hourly Weather Data ---
     print(f"\nLoading and summarizing hourly weather data from: {weather_path}")
     try:
-        weather_df = pd.read_csv(weather_path)
-        weather_df['Datetime'] = pd.to_datetime(weather_df['Datetime'])
-        city_cols = [f'City_{city}' for city in TARGET_CITIES]
-        weather_df['City'] = weather_df[[col for col in city_cols if col in weather_df.columns]].idxmax(axis=1).str.replace('City_', '')
+        weather_df = pd.read_csv(weather_path,
+                                 usecols=lambda col: col in WEATHER_SUMMARY_COLS or col == 'Datetime' or col.startswith('City_'),
+                                 dtype=WEATHER_DTYPES, parse_dates=['Datetime'], date_format=HOURLY_DATE_FORMAT)
+        # Recover City from the one-hot columns: the argmax column index is the category code.
+        cities = [city for city in TARGET_CITIES if f'City_{city}' in weather_df.columns]
+        city_codes = weather_df[[f'City_{city}' for city in cities]].to_numpy(dtype=np.int8).argmax(axis=1)
+        weather_df['City'] = pd.Categorical.from_codes(city_codes, categories=cities)
         
         weather_df['Date'] = weather_df['Datetime'].dt.normalize()
         aggregations = {
             'temperature_2m': ['mean', 'min', 'max'],
             'relative_humidity_2m': ['mean'], 'precipitation': ['sum'], 'wind_speed_10m': ['mean']
         }
-        daily_weather_df = weather_df.groupby(['City', 'Date']).agg(aggregations).reset_index()
-        daily_weather_df.columns = ['_'.join(col).strip() for col in daily_weather_df.columns.values]
-        daily_weather_df.rename(columns={'City_': 'City', 'Date_': 'Date'}, inplace=True)
+        # Keep the sorted (City, Date) index from the groupby; the merge below joins on it.
+        daily_weather_df = weather_df.groupby(['City', 'Date'], observed=True).agg(aggregations)
+        daily_weather_df.columns = ['_'.join(col) for col in daily_weather_df.columns.values]
         print(f"  -> Created {len(daily_weather_df)} daily weather summary records.")
     except Exception as e:
         print(f"ERROR: Failed during weather processing. Reason: {e}")
@@ -64,29 +93,43 @@ def create_daily_features(aqi_path, weather_path, output_path):
 
     # --- Step 3: Merge, Add Coordinates, and Engineer Features ---
     print("\nMerging data...")
-    master_df = pd.merge(aqi_df, daily_weather_df, on=['Date', 'City'], how='inner')
+    aqi_df = aqi_df.set_index(['City', 'Date']).sort_index()
+    master_df = aqi_df.join(daily_weather_df, how='inner').reset_index()
+    master_df.insert(0, 'Date', master_df.pop('Date'))
     print(f"  -> Merged dataset shape: {master_df.shape}")
     
     print("Adding station coordinates...")
-    lat_map = {city: details['lat'] for city, details in TARGET_STATIONS.items()}
-    lon_map = {city: details['lon'] for city, details in TARGET_STATIONS.items()}
-    master_df['latitude'] = master_df['City'].map(lat_map)
-    master_df['longitude'] = master_df['City'].map(lon_map)
+    # Gather from small per-station arrays by city position; the trailing NaN is picked up by code -1 (unknown city).
+    station_codes = pd.Index(list(TARGET_STATIONS)).get_indexer(master_df['City'])
+    lat_arr = np.array([details['lat'] for details in TARGET_STATIONS.values()] + [np.nan], dtype=np.float32)
+    lon_arr = np.array([details['lon'] for details in TARGET_STATIONS.values()] + [np.nan], dtype=np.float32)
+    master_df['latitude'] = lat_arr[station_codes]
+    master_df['longitude'] = lon_arr[station_codes]
     
     print("Engineering time and lag features...")
     master_df = master_df.sort_values(by=['City', 'Date']).reset_index(drop=True)
     master_df['day_of_week'] = master_df['Date'].dt.dayofweek
     master_df['month'] = master_df['Date'].dt.month
     master_df['year'] = master_df['Date'].dt.year
-    master_df['AQI_lag_1_day'] = master_df.groupby('City')['AQI'].shift(1)
-    master_df['AQI_lag_7_day'] = master_df.groupby('City')['AQI'].shift(7)
+    aqi_values = master_df['AQI'].to_numpy()
+    city_codes, _ = pd.factorize(master_df['City'])
+    master_df['AQI_lag_1_day'] = lag_within_groups(aqi_values, city_codes, 1)
+    master_df['AQI_lag_7_day'] = lag_within_groups(aqi_values, city_codes, 7)
     master_df.dropna(inplace=True)
     
-    # --- Step 4: Save Final Dataset ---
+    # --- Step 4: Downcast and Save Final Dataset ---
+    float_cols = master_df.select_dtypes('float').columns
+    master_df[float_cols] = master_df[float_cols].astype(np.float32)
+    master_df = master_df.astype({'day_of_week': np.int8, 'month': np.int8, 'year': np.int16})
     print("\n--- Feature Engineering Complete ---")
     print(f"Final dataset shape: {master_df.shape}")
     master_df.to_csv(output_path, index=False)
     print(f"Successfully saved final dataset to: {output_path}")
+    # The CSV stays the interchange format; the Parquet copy (also csv_cache's snapshot for it) loads much faster.
+    if HAS_PYARROW:
+        parquet_path = parquet_cache_path(output_path)
+        master_df.to_parquet(parquet_path, engine='pyarrow', compression='zstd', index=False)
+        print(f"Saved Parquet copy to: {parquet_path}")
 
 if __name__ == "__main__":
     create_daily_features(AQI_DATA_PATH, WEATHER_DATA_PATH, OUTPUT_FILE_PATH)
\ No newline at end of file
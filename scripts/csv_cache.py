@@ -0,0 +1,78 @@
+# File: scripts/csv_cache.py
+
+"""
+CSV loading helpers for the data-preparation scripts.
+
+`read_csv_cached` parses a CSV once and stores the resulting frame in a sibling
+`.parquet` file. Later runs read the snapshot instead, which skips CSV
+tokenizing and date parsing entirely, until the CSV is modified again.
+
+`AQI_DTYPES` and `WEATHER_DTYPES` are `dtype=` maps for the source columns:
+float32 numerics and categorical labels instead of pandas' inferred
+float64/object. Columns absent from a given file are ignored by `read_csv`.
+"""
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    print("Warning: pyarrow not installed; CSV files will be parsed on every run.")
+    HAS_PYARROW = False
+
+# --- Column dtypes ---
+AQI_DTYPES = {
+    'City': 'category', 'AQI_Bucket': 'category',
+    **{col: 'float32' for col in [
+        'PM2.5', 'PM10', 'NO', 'NO2', 'NOx', 'NH3', 'CO', 'SO2', 'O3',
+        'Benzene', 'Toluene', 'Xylene', 'AQI'
+    ]},
+}
+WEATHER_DTYPES = {col: 'float32' for col in [
+    'temperature_2m', 'relative_humidity_2m', 'dew_point_2m', 'apparent_temperature',
+    'precipitation', 'rain', 'snowfall', 'snow_depth', 'pressure_msl', 'surface_pressure',
+    'cloud_cover', 'cloud_cover_low', 'cloud_cover_mid', 'cloud_cover_high',
+    'wind_speed_10m', 'wind_speed_100m', 'wind_direction_10m',
+    'wind_direction_100m', 'wind_gusts_10m'
+]}
+HOURLY_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+DAILY_DATE_FORMAT = '%Y-%m-%d'
+
+
+def parquet_cache_path(csv_path):
+    """Returns the path of the Parquet snapshot kept next to `csv_path`."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def read_csv_cached(csv_path, **read_csv_kwargs):
+    """
+    Reads a CSV through its Parquet snapshot, rebuilding the snapshot when the CSV is newer.
+
+    The snapshot stores the frame exactly as parsed with `read_csv_kwargs`, so
+    every caller of a given CSV should pass the same arguments.
+
+    Args:
+        csv_path (str): Path of the source CSV file.
+        **read_csv_kwargs: Passed to `pd.read_csv` when the snapshot is rebuilt.
+
+    Returns:
+        pd.DataFrame: The parsed CSV contents.
+    """
+    if not HAS_PYARROW:
+        return pd.read_csv(csv_path, **read_csv_kwargs)
+
+    cache_path = parquet_cache_path(csv_path)
+    try:
+        if os.path.getmtime(cache_path) >= os.path.getmtime(csv_path):
+            return pd.read_parquet(cache_path, engine='pyarrow')
+    except OSError:
+        pass  # No snapshot yet (or the CSV is missing, which read_csv reports below).
+
+    df = pd.read_csv(csv_path, **read_csv_kwargs)
+    try:
+        df.to_parquet(cache_path, engine='pyarrow', compression='zstd')
+    except (OSError, ValueError) as e:  # ValueError covers pyarrow's ArrowInvalid (mixed-type columns).
+        print(f"Warning: could not write Parquet cache {cache_path}: {e}")
+    return df
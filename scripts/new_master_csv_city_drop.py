@@ -1,8 +1,9 @@
 # File: scripts/new_master_csv_city_drop.py
 
-import pandas as pd
+from csv_cache import AQI_DTYPES, HOURLY_DATE_FORMAT, WEATHER_DTYPES, read_csv_cached
 
-df = pd.read_csv('Master_AQI_Weather_India_CatEncoded.csv', parse_dates=['Datetime'])
+df = read_csv_cached('Master_AQI_Weather_India_CatEncoded.csv', dtype={**AQI_DTYPES, **WEATHER_DTYPES},
+                     parse_dates=['Datetime'], date_format=HOURLY_DATE_FORMAT)
 
 df = df.drop(columns=['City'])
 
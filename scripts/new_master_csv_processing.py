@@ -1,7 +1,12 @@
 # File: scripts/new_master_csv_processing.py
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
+from csv_cache import AQI_DTYPES, HOURLY_DATE_FORMAT, WEATHER_DTYPES, read_csv_cached
+
 weather_files = {
     'Bangalore': 'Bangalore.csv',
     'Chennai': 'Chennai.csv',
@@ -14,18 +19,30 @@ aqi_cols = [
     'City', 'Datetime', 'PM2.5', 'PM10', 'NO', 'NO2', 'NOx', 'NH3',
     'CO', 'SO2', 'O3', 'Benzene', 'Toluene', 'Xylene', 'AQI', 'AQI_Bucket'
 ]
-aqi_df = pd.read_csv('city_hour.csv', usecols=aqi_cols, parse_dates=['Datetime'])
-aqi_df['Datetime'] = pd.to_datetime(aqi_df['Datetime']).dt.tz_localize(None)
+aqi_df = read_csv_cached('city_hour.csv', usecols=aqi_cols, dtype=AQI_DTYPES,
+                         parse_dates=['Datetime'], date_format=HOURLY_DATE_FORMAT)
 
-merged_city_dfs = []
+# Split the AQI rows by lower-cased city in one pass instead of filtering once per city.
+aqi_by_city = dict(list(aqi_df.groupby(aqi_df['City'].str.lower(), sort=False)))
+empty_aqi_df = aqi_df.iloc[:0]
 
-for city, weather_file in weather_files.items():
-    weather_df = pd.read_csv(weather_file, parse_dates=['date'])
+def load_weather(city, weather_file):
+    weather_df = read_csv_cached(weather_file, dtype=WEATHER_DTYPES, parse_dates=['date'])
     weather_df.rename(columns={'date': 'Datetime'}, inplace=True)
-    weather_df['Datetime'] = pd.to_datetime(weather_df['Datetime']).dt.tz_localize(None)
-    weather_df['City'] = city 
+    # Already parsed by read_csv; only timestamps with a UTC offset need their tz dropped to match city_hour.csv.
+    if weather_df['Datetime'].dt.tz is not None:
+        weather_df['Datetime'] = weather_df['Datetime'].dt.tz_localize(None)
+    weather_df['City'] = city
+    return weather_df
+
+# pandas' C parser releases the GIL, so the weather files can be read concurrently.
+with ThreadPoolExecutor(max_workers=len(weather_files)) as executor:
+    weather_dfs = dict(zip(weather_files, executor.map(load_weather, weather_files, weather_files.values())))
+
+merged_city_dfs = []
 
-    city_aqi_df = aqi_df[aqi_df['City'].str.lower() == city.lower()]
+for city, weather_df in weather_dfs.items():
+    city_aqi_df = aqi_by_city.get(city.lower(), empty_aqi_df)
 
     merged = pd.merge(city_aqi_df, weather_df, on=['City', 'Datetime'], how='inner')
     merged_city_dfs.append(merged)
@@ -33,9 +50,15 @@ for city, weather_file in weather_files.items():
 final_df = pd.concat(merged_city_dfs, ignore_index=True)
 
 city_names = list(weather_files.keys())
-for c in city_names:
-    colname = 'City_' + c.replace(" ", "_")
-    final_df[colname] = (final_df['City'].str.lower() == c.lower()).astype(int)
+# Lower-case the City column once and one-hot encode it from each row's position in city_names.
+# Cities outside city_names get code -1 and stay all zeros.
+city_codes = pd.Index([c.lower() for c in city_names]).get_indexer(final_df['City'].str.lower())
+rows = np.flatnonzero(city_codes >= 0)
+one_hot = np.zeros((len(final_df), len(city_names)), dtype=np.int8)
+one_hot[rows, city_codes[rows]] = 1
+# Attach all K columns with one concat rather than K column insertions.
+one_hot_df = pd.DataFrame(one_hot, columns=['City_' + c.replace(" ", "_") for c in city_names], index=final_df.index)
+final_df = pd.concat([final_df, one_hot_df], axis=1)
 
 start_date = pd.to_datetime('2015-01-01 00:00:00')
 final_df = final_df[final_df['Datetime'] >= start_date]
@@ -0,0 +1,362 @@
+# File: shared_data.py
+
+"""
+Central in-memory data store for the live Performance Hub.
+
+The background sampler (see `sampler.py`) writes into the `metrics` ring
+buffer and the callbacks in `pages/performance.py` read from it. Each metric
+lives in its own preallocated NumPy array (structure-of-arrays), so charts can
+take ordered slices without building per-sample Python objects.
+
+The buffer lives in a named shared-memory segment, so when the app runs under
+several worker processes (e.g. gunicorn) they all read the same samples while
+only one of them polls psutil. If shared memory is unavailable the buffer
+falls back to private process memory.
+
+The segment's header records who laid it out (capacity, layout version and a
+run id), so samples left behind by an earlier run are discarded rather than
+shown as live, and the last process to detach unlinks the segment.
+"""
+import atexit
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import fcntl
+except ImportError:  # Windows frees shared memory with its last handle; no attach lock is needed there.
+    fcntl = None
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Number of samples kept per metric (at 500 ms per sample this is ~5 minutes).
+MAX_DATA_POINTS = 600
+
+# Name of the shared-memory segment holding the samples.
+SHM_NAME = os.environ.get("BREATHEEASY_SHM_NAME", "breatheeasy_samples")
+# Every process attached to the segment holds this file's flock shared; whoever can take it
+# exclusively is alone with the segment. The init lock serializes attaching and detaching.
+ATTACH_LOCK_PATH = os.path.join(tempfile.gettempdir(), f"{SHM_NAME}.attach")
+INIT_LOCK_PATH = os.path.join(tempfile.gettempdir(), f"{SHM_NAME}.init")
+
+METRIC_FIELDS = ('ts', 'cpu', 'ram', 'net_in', 'net_out')
+
+# One reading of every metric, taken at the same instant.
+Sample = namedtuple("Sample", METRIC_FIELDS)
+
+# Buffer layout: an int64 header [sequence, cursor, capacity, layout version, run id]
+# followed by one array per metric. Bump _LAYOUT_VERSION whenever the layout changes.
+_HEADER_ITEMS = 5
+_LAYOUT_VERSION = 2
+_FIELD_DTYPES = (('ts', np.dtype('datetime64[ms]')), ('cpu', np.dtype(np.float32)),
+                 ('ram', np.dtype(np.float32)), ('net_in', np.dtype(np.float32)),
+                 ('net_out', np.dtype(np.float32)))
+
+
+def _run_id():
+    """
+    Returns an int64 identifying this run of the app.
+
+    All worker processes of one run (gunicorn's forks, the dev server's reloader
+    child) share a process group, so the id hashes the machine's boot id with
+    the group leader's pid and start time. It differs after a restart or reboot.
+    """
+    pgid = os.getpgid(0) if hasattr(os, 'getpgid') else os.getppid()
+    parts = [str(pgid)]
+    try:
+        with open('/proc/sys/kernel/random/boot_id') as f:
+            parts.append(f.read().strip())
+        with open(f'/proc/{pgid}/stat') as f:
+            # Field 22 (starttime); the command name before it may contain spaces.
+            parts.append(f.read().rsplit(')', 1)[1].split()[19])
+    except (OSError, IndexError):
+        pass  # No /proc (not Linux): the process group id alone distinguishes runs.
+    digest = hashlib.blake2b('|'.join(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+
+RUN_ID = _run_id()
+
+
+def ring_nbytes(capacity):
+    """Returns the number of bytes a `MetricsRing` of the given capacity occupies."""
+    return 8 * _HEADER_ITEMS + sum(dtype.itemsize * capacity for _, dtype in _FIELD_DTYPES)
+
+
+class MetricsRing:
+    """
+    Fixed-capacity ring buffer of system-metric samples.
+
+    The arrays are views into a single buffer (private or shared memory).
+    Writes are bracketed by a sequence counter (a seqlock): it is odd while a
+    sample is being written, and readers retry if it was odd or changed while
+    they copied. Readers therefore never see CPU from one sample paired with
+    RAM from another, even across processes. There must be only one writing
+    process.
+
+    A shared buffer only counts as holding samples once its header carries this
+    ring's capacity, layout version and `RUN_ID`; `claim_writer` stamps them.
+    Until then readers see an empty ring.
+
+    Attributes:
+        ts (np.ndarray): Sample timestamps as `datetime64[ms]` (local time).
+        cpu, ram (np.ndarray): CPU and RAM usage in percent (`float32`).
+        net_in, net_out (np.ndarray): Network receive/send rates in KB/s (`float32`).
+    """
+
+    def __init__(self, capacity, buffer=None):
+        self.capacity = capacity
+        self._identity = np.array([capacity, _LAYOUT_VERSION, RUN_ID], dtype=np.int64)
+        self._write_lock = threading.Lock()
+        self.bind(buffer)
+
+    def bind(self, buffer=None):
+        """Points the ring's arrays at `buffer` (or fresh private memory if None)."""
+        private = buffer is None
+        if private:
+            buffer = bytearray(ring_nbytes(self.capacity))
+        self._header = np.frombuffer(buffer, dtype=np.int64, count=_HEADER_ITEMS)
+        offset = 8 * _HEADER_ITEMS
+        for field, dtype in _FIELD_DTYPES:
+            setattr(self, field, np.frombuffer(buffer, dtype=dtype, count=self.capacity, offset=offset))
+            offset += dtype.itemsize * self.capacity
+        if private:
+            self._header[2:] = self._identity
+
+    def _is_current(self):
+        """True if the buffer was laid out by this run, with this ring's capacity and layout."""
+        return np.array_equal(self._header[2:], self._identity)
+
+    @property
+    def cursor(self):
+        """Total number of samples written this run (0 until the buffer is claimed)."""
+        return int(self._header[1]) if self._is_current() else 0
+
+    def __len__(self):
+        return min(self.cursor, self.capacity)
+
+    def append(self, sample):
+        """Writes one `Sample`, overwriting the oldest once the buffer is full."""
+        header = self._header
+        with self._write_lock:
+            header[0] += 1
+            i = header[1] % self.capacity
+            self.ts[i], self.cpu[i], self.ram[i], self.net_in[i], self.net_out[i] = sample
+            header[1] += 1
+            header[0] += 1
+
+    def claim_writer(self):
+        """
+        Prepares the buffer for a new writing process.
+
+        On the first claim of a run, a buffer left by an earlier run or laid out
+        for another capacity or layout version is emptied and stamped with this
+        ring's identity. A later leader of the same run keeps the samples and
+        only clears a sequence counter left odd by a writer that died mid-sample.
+        """
+        header = self._header
+        with self._write_lock:
+            if self._is_current():
+                if header[0] % 2:
+                    header[0] += 1
+                return
+            header[0] |= 1  # Odd: readers retry until the reset is complete.
+            header[1] = 0
+            header[2:] = self._identity
+            header[0] += 1
+
+    def _read_consistent(self, read, max_attempts=1000):
+        """
+        Calls `read(cursor)` until it completes without a concurrent write.
+
+        Gives up waiting after `max_attempts` and returns the last read, so a
+        writer that died mid-sample cannot stall readers.
+        """
+        header = self._header
+        for _ in range(max_attempts):
+            seq = int(header[0])
+            if seq % 2:
+                time.sleep(0)
+                continue
+            result = read(self.cursor)
+            if int(header[0]) == seq:
+                return result
+        return read(self.cursor)
+
+    def _ordered(self, arr, cursor):
+        if cursor <= self.capacity:
+            return arr[:cursor].copy()
+        split = cursor % self.capacity
+        return np.concatenate((arr[split:], arr[:split]))
+
+    def series(self, *fields):
+        """
+        Returns the requested metrics ordered from oldest to newest sample.
+
+        All fields are copied from the same consistent snapshot, so they line
+        up sample for sample. Returns a single array for one field, otherwise
+        a tuple.
+        """
+        result = self._read_consistent(
+            lambda cursor: tuple(self._ordered(getattr(self, field), cursor) for field in fields))
+        return result[0] if len(result) == 1 else result
+
+    def _tail(self, arr, cursor, count):
+        return arr[np.arange(cursor - count, cursor) % self.capacity]
+
+    def series_since(self, start, *fields):
+        """
+        Returns the samples written after the first `start` ones, with the cursor they end at.
+
+        Lets a reader that already holds samples up to `start` fetch only the
+        new ones. At most the last `capacity` samples are returned, and all
+        fields come from the same consistent snapshot.
+
+        Returns:
+            tuple: (cursor, array per field), arrays ordered oldest to newest.
+        """
+        def read(cursor):
+            count = min(cursor - start, self.capacity) if cursor > start else 0
+            return (cursor,) + tuple(self._tail(getattr(self, field), cursor, count) for field in fields)
+        return self._read_consistent(read)
+
+    def latest(self):
+        """Returns the most recent `Sample`, or None if nothing has been recorded yet."""
+        def read(cursor):
+            if cursor == 0:
+                return None
+            i = (cursor - 1) % self.capacity
+            return Sample(self.ts[i], self.cpu[i].item(), self.ram[i].item(),
+                          self.net_in[i].item(), self.net_out[i].item())
+        return self._read_consistent(read)
+
+
+def _attach_shared_memory(capacity):
+    """
+    Creates or attaches to the named shared-memory segment for the samples.
+
+    Attaching and detaching are serialized by the init lock. If no other
+    process holds the attach lock, any existing segment was left behind by a
+    run that crashed, so it is unlinked and a fresh one created. This process
+    then holds the attach lock shared until it exits.
+
+    Returns:
+        SharedMemory | None: The segment, or None if shared memory is unusable.
+    """
+    global _attach_lock_file
+    try:
+        from multiprocessing import resource_tracker, shared_memory
+    except ImportError:
+        return None
+    if fcntl is None:
+        return _open_segment(shared_memory, resource_tracker, ring_nbytes(capacity))
+
+    shm = None
+    try:
+        with open(INIT_LOCK_PATH, 'a') as init_lock:
+            fcntl.flock(init_lock, fcntl.LOCK_EX)
+            _attach_lock_file = open(ATTACH_LOCK_PATH, 'a')
+            try:
+                fcntl.flock(_attach_lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                pass  # Other processes are attached, so the segment belongs to this run.
+            else:
+                _unlink_stale_segment(shared_memory)
+            fcntl.flock(_attach_lock_file, fcntl.LOCK_SH)
+            shm = _open_segment(shared_memory, resource_tracker, ring_nbytes(capacity))
+    except OSError as e:
+        log.warning(f"Could not lock the shared memory segment ({e}); performance metrics stay process-local.")
+    if shm is None:
+        _release_attach_lock()
+    return shm
+
+
+def _unlink_stale_segment(shared_memory):
+    """Removes a segment no process is attached to (left behind by a crashed run), if one exists."""
+    try:
+        stale = shared_memory.SharedMemory(name=SHM_NAME)
+    except (FileNotFoundError, ValueError):
+        return
+    stale.close()
+    stale.unlink()
+    log.info(f"Removed stale shared memory segment '{SHM_NAME}' from an earlier run.")
+
+
+def _open_segment(shared_memory, resource_tracker, size):
+    """Creates the segment, or attaches to an existing one that is large enough; None on failure."""
+    for _ in range(50):
+        try:
+            shm = shared_memory.SharedMemory(name=SHM_NAME, create=True, size=size)
+        except FileExistsError:
+            try:
+                shm = shared_memory.SharedMemory(name=SHM_NAME)
+            except (FileNotFoundError, ValueError):
+                # Another process is still creating (or removing) the segment.
+                time.sleep(0.01)
+                continue
+        except OSError as e:
+            log.warning(f"Shared memory unavailable ({e}); performance metrics stay process-local.")
+            return None
+
+        # Workers come and go independently; don't let the first one to exit unlink the segment.
+        try:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        if shm.size < size:
+            log.warning(f"Shared memory segment '{SHM_NAME}' is too small; performance metrics stay process-local.")
+            shm.close()
+            return None
+        return shm
+
+    log.warning(f"Could not attach to shared memory segment '{SHM_NAME}'; performance metrics stay process-local.")
+    return None
+
+
+def _release_attach_lock():
+    """Closes the attach lock file, releasing its flock."""
+    global _attach_lock_file
+    if _attach_lock_file is not None:
+        _attach_lock_file.close()
+        _attach_lock_file = None
+
+
+def _close_shared_memory():
+    """
+    Detaches the ring from the segment at exit, unlinking the segment if no other process uses it.
+
+    Every attached process holds the attach lock shared, so the one that can
+    take it exclusively is the last. Surviving workers take over sampling when
+    the leader exits, so this is the last leader (or a process that never
+    sampled). The next start then creates a fresh segment.
+    """
+    metrics.bind(None)
+    _shm.close()
+    if _attach_lock_file is None:
+        return
+    try:
+        with open(INIT_LOCK_PATH, 'a') as init_lock:
+            fcntl.flock(init_lock, fcntl.LOCK_EX)
+            fcntl.flock(_attach_lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            from multiprocessing import resource_tracker
+            # unlink() unregisters the segment again; re-register it to keep the tracker balanced.
+            resource_tracker.register(_shm._name, "shared_memory")
+            _shm.unlink()
+    except OSError:
+        pass  # Other processes are still attached (or the segment is already gone).
+    finally:
+        _release_attach_lock()
+
+
+_attach_lock_file = None
+_shm = _attach_shared_memory(MAX_DATA_POINTS)
+IS_SHARED = _shm is not None
+metrics = MetricsRing(MAX_DATA_POINTS, _shm.buf if IS_SHARED else None)
+if IS_SHARED:
+    atexit.register(_close_shared_memory)
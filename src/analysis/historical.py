@@ -7,6 +7,7 @@ import pandas as pd
 import os
 import sys
 import logging
+import threading
 
 # --- Setup Path & Get Logger ---
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -16,22 +17,50 @@ log = logging.getLogger(__name__)
 
 # --- Configuration ---
 DATA_PATH = os.path.join(PROJECT_ROOT, "data", "Post-Processing", "CSV_Files", "Master_Features_AQI_Data.csv")
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+# float32 readings and a categorical City roughly halve the in-memory size versus pandas' inferred float64/object.
+COLUMN_DTYPES = {
+    'City': 'category',
+    **{col: 'float32' for col in [
+        'latitude', 'longitude', 'AQI', 'PM2.5', 'PM10', 'NO2', 'CO', 'SO2', 'O3',
+        'temperature_2m', 'relative_humidity_2m', 'precipitation', 'wind_speed_10m',
+        'wind_direction_10m', 'AQI_lag_1hr', 'AQI_lag_24hr'
+    ]},
+}
 _df_cached = None
+_city_frames = {}  # City name -> that city's rows (Datetime-sorted), split once when the dataset is loaded.
+_load_lock = threading.Lock()
+
+def _load_dataset():
+    """
+    Reads the dataset and splits it by city, once per process.
+
+    Both results are built in locals and published under a lock, `_df_cached`
+    last, so a concurrent caller never sees a loaded frame without its
+    per-city partitions.
+    """
+    global _df_cached, _city_frames
+    with _load_lock:
+        if _df_cached is not None:
+            return
+        log.info(f"Loading historical feature data from: {DATA_PATH}")
+        df = pd.read_csv(DATA_PATH, dtype=COLUMN_DTYPES,
+                         parse_dates=['Datetime'], date_format=DATE_FORMAT)
+        df = df.set_index('Datetime')
+        _city_frames = {city: group.sort_index() for city, group in df.groupby('City', observed=True, sort=False)}
+        _df_cached = df
 
 def get_historical_data_for_city(city_name: str):
     """
     Loads the master feature dataset and returns the data for a specific city.
     """
-    global _df_cached
     if _df_cached is None:
-        log.info(f"Loading historical feature data from: {DATA_PATH}")
         try:
-            _df_cached = pd.read_csv(DATA_PATH, parse_dates=['Datetime'])
-            _df_cached = _df_cached.set_index('Datetime')
+            _load_dataset()
         except FileNotFoundError:
             log.error(f"FATAL: Master feature data file not found at {DATA_PATH}")
             return pd.DataFrame()
     
-    city_data = _df_cached[_df_cached['City'] == city_name].copy()
+    city_data = _city_frames.get(city_name, _df_cached.iloc[:0]).copy()
     log.info(f"Returning {len(city_data)} historical records for {city_name}.")
-    return city_data
\ No newline at end of file
+    return city_data
@@ -12,12 +12,24 @@ Dependencies:
 - API base URL is configured via config/config.yaml.
 """
 
-import requests
 import os
 import logging
-from dotenv import load_dotenv
 import sys
 import json
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import quote
+
+# orjson parses response bodies several times faster than the stdlib decoder.
+# Its JSONDecodeError subclasses ValueError, like json's, so error handling is unchanged.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # --- Setup Project Root Path ---
 try:
@@ -55,25 +67,190 @@ except Exception as e:
 
 log = logging.getLogger(__name__) 
 
-# --- Load API Token from .env file ---
-try:
-    dotenv_path = os.path.join(PROJECT_ROOT, '.env') 
-    if os.path.exists(dotenv_path):
-        loaded = load_dotenv(dotenv_path=dotenv_path)
-        if loaded:
-            log.info(f"AQICN Client: Loaded .env file from: {dotenv_path}")
-    else:
-        log.warning(f"AQICN Client: .env file not found at: {dotenv_path}. API keys must be set in environment.")
-except Exception as e:
-    log.error(f"AQICN Client: Error loading .env file: {e}", exc_info=True)
+# --- Request Settings ---
+# Read once at import so each request does no config lookups. A base URL that is
+# set but is not an http(s) URL is a configuration mistake, reported here rather
+# than on the first request.
+_AQICN_BASE_URL = (CONFIG.get('apis', {}).get('aqicn', {}).get('base_url') or "https://api.waqi.info/feed")
+if not isinstance(_AQICN_BASE_URL, str) or not _AQICN_BASE_URL.startswith(("http://", "https://")):
+    raise ConfigError(f"Invalid AQICN base URL in configuration (config.yaml): {_AQICN_BASE_URL!r}")
+_AQICN_BASE_URL = _AQICN_BASE_URL.rstrip('/')
+_URL_PREFIX = _AQICN_BASE_URL + '/'
+_API_TIMEOUT = float(CONFIG.get('api_timeout_seconds', 10))
+
+# --- Lazy Initialization ---
+# requests (with urllib3, certifi, ...) and the .env file are only loaded by the
+# first API call, so importing this module for its helpers stays cheap.
+_POOL_MAXSIZE = 20
+_INITIALIZED = False
+_INIT_LOCK = threading.Lock()
+requests = None  # Bound to the requests module by _ensure_initialized().
+_SESSION = None
+AQICN_TOKEN = None
+
+
+def _ensure_initialized():
+    """
+    Imports requests, loads the .env file and builds the shared HTTP session, once.
 
-AQICN_TOKEN = os.getenv('AQICN_API_TOKEN')
-if not AQICN_TOKEN: 
-    log.warning("AQICN_API_TOKEN is not set. AQICN API calls will likely fail with APIKeyError.")
+    One pooled Session keeps the connection to the AQICN host alive between calls,
+    so only the first request pays for the TCP/TLS handshake. Connection failures
+    and 502/503/504 responses are retried with a short backoff; read timeouts are
+    not (read=False), so they still surface as a Timeout after one attempt.
+    """
+    global _INITIALIZED, requests, _SESSION, AQICN_TOKEN
+    if _INITIALIZED:
+        return
+    with _INIT_LOCK:
+        if _INITIALIZED:
+            return
+        import requests as requests_module
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        from dotenv import load_dotenv
+
+        # --- Load API Token from .env file ---
+        try:
+            dotenv_path = os.path.join(PROJECT_ROOT, '.env') 
+            if os.path.exists(dotenv_path):
+                loaded = load_dotenv(dotenv_path=dotenv_path)
+                if loaded:
+                    log.info(f"AQICN Client: Loaded .env file from: {dotenv_path}")
+            else:
+                log.warning(f"AQICN Client: .env file not found at: {dotenv_path}. API keys must be set in environment.")
+        except Exception as e:
+            log.error(f"AQICN Client: Error loading .env file: {e}", exc_info=True)
+
+        AQICN_TOKEN = os.getenv('AQICN_API_TOKEN')
+        if not AQICN_TOKEN: 
+            log.warning("AQICN_API_TOKEN is not set. AQICN API calls will likely fail with APIKeyError.")
+
+        # --- Shared HTTP Session ---
+        session = requests_module.Session()
+        session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=_POOL_MAXSIZE,
+            max_retries=Retry(total=2, read=False, backoff_factor=0.2, status_forcelist=(502, 503, 504),
+                              allowed_methods=frozenset({'GET'}), raise_on_status=False),
+        ))
+
+        requests, _SESSION = requests_module, session
+        _INITIALIZED = True
+
+
+def _get_token():
+    """Returns the AQICN API token (None if unset), initializing the client on first use."""
+    _ensure_initialized()
+    return AQICN_TOKEN
+
+
+# --- Response Cache ---
+# Successful responses per lower-cased city query, as {key: _CacheEntry}.
+# AQICN stations update hourly, so a short TTL lets the current-AQI and
+# pollutant-risk wrappers share one request per city. Expired entries are kept
+# for their validators (ETag / Last-Modified): the next fetch is a conditional
+# request, and a 304 reply reuses the cached data without a body download.
+# If the API is down or times out, an entry up to `apis.aqicn.stale_ttl_seconds`
+# past its expiry is served instead, marked with '_stale': True.
+# Each entry also holds the parsed `_AQICNView` of its data, so polling a cached
+# city does not walk the response dict again.
+_CacheEntry = namedtuple("_CacheEntry", ("expires_at", "data", "etag", "last_modified", "view"))
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+# Fetches in progress, as {key: Future}. A caller that finds its city here waits
+# for that fetch's result instead of sending an identical request (single-flight).
+_INFLIGHT = {}
+
+
+def clear_cache():
+    """Drops all cached AQICN responses."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
 
 
 # --- Core API Data Fetching Function ---
-def get_city_aqi_data(city_name_query):
+def get_city_aqi_data(city_name_query, force_refresh=False):
+    """
+    Fetches full real-time AQI and pollutant data from the AQICN API.
+
+    Successful responses are cached per city for `apis.aqicn.cache_ttl_seconds`
+    (default 120); errors and unknown stations are never cached. When a
+    refresh fails with a timeout or service error, a cached response no older
+    than `apis.aqicn.stale_ttl_seconds` (default 3600) past its expiry is
+    returned as a copy with '_stale' set to True.
+
+    Args:
+        city_name_query (str): The city name to query (e.g., 'Delhi').
+        force_refresh (bool): If True, skips the cache and always calls the API.
+
+    Returns:
+        dict | None: See `_fetch_city_aqi_data`.
+
+    Raises:
+        The exceptions raised by `_fetch_city_aqi_data`.
+    """
+    _ensure_initialized()
+    key = city_name_query.lower()
+    entry = None
+    if not force_refresh:
+        with _CACHE_LOCK:
+            entry = _CACHE.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            log.debug(f"Using cached AQICN response for '{city_name_query}'.")
+            return entry.data
+
+    with _CACHE_LOCK:
+        future = _INFLIGHT.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _INFLIGHT[key] = Future()
+    if not is_owner:
+        log.debug(f"Waiting for in-flight AQICN request for '{city_name_query}'.")
+        try:
+            # Allow for the owner's retries (up to three attempts) before giving up.
+            return future.result(timeout=(_API_TIMEOUT + 1) * 3)
+        except APIError:
+            raise  # The owner's own failure (APITimeoutError is also a TimeoutError); pass it on as-is.
+        except TimeoutError as e:
+            raise APITimeoutError(f"Timed out waiting for in-flight AQICN request for '{city_name_query}'.", service="AQICN") from e
+
+    try:
+        data = _refresh_city_aqi_data(city_name_query, key, entry)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(data)
+        return data
+    finally:
+        with _CACHE_LOCK:
+            del _INFLIGHT[key]
+
+
+def _refresh_city_aqi_data(city_name_query, key, entry):
+    """Fetches a city from the API and updates its cache entry, falling back to stale data on errors."""
+    aqicn_config = CONFIG.get('apis', {}).get('aqicn', {})
+    try:
+        data, etag, last_modified = _fetch_city_aqi_data(city_name_query, entry)
+    except (APIKeyError, APINotFoundError):
+        raise
+    except APIError as e:
+        if entry is None:
+            with _CACHE_LOCK:
+                entry = _CACHE.get(key)
+        if entry is None or time.monotonic() - entry.expires_at > aqicn_config.get('stale_ttl_seconds', 3600):
+            raise
+        log.warning(f"Serving stale AQICN response for '{city_name_query}' after error: {e}")
+        return {**entry.data, '_stale': True}
+    if data is not None:
+        ttl = aqicn_config.get('cache_ttl_seconds', 120)
+        with _CACHE_LOCK:
+            view = entry.view if entry is not None and entry.data is data else _parse_aqicn_payload(data)
+            _CACHE[key] = _CacheEntry(time.monotonic() + ttl, data, etag, last_modified, view)
+    return data
+
+
+def _fetch_city_aqi_data(city_name_query, cached=None):
     """
     Fetches full real-time AQI and pollutant data from the AQICN API.
 
@@ -81,49 +258,59 @@ def get_city_aqi_data(city_name_query):
 
     Args:
         city_name_query (str): The city name to query (e.g., 'Delhi').
+        cached (_CacheEntry | None): A previous response for this city. If it
+            carries validators, the request is conditional and a 304 reply
+            returns its data.
 
     Returns:
-        dict | None: The full JSON response from the API if successful.
-                     Returns None if the API response indicates an "Unknown station".
+        tuple: (data, etag, last_modified). `data` is the full JSON response
+            from the API if successful, or None if the API response indicates
+            an "Unknown station"; the validators are None if not sent.
 
     Raises:
         APIKeyError: If the AQICN_API_TOKEN is not configured.
-        ConfigError: If the AQICN base URL is not found in the config.
         APITimeoutError: If the request times out.
         APINotFoundError: If the API endpoint returns a 404 error.
         APIError: For other API-related errors (e.g., non-200 status codes).
         ValueError: If the API response is not valid JSON.
     """
-    aqicn_base_url = CONFIG.get('apis', {}).get('aqicn', {}).get('base_url', "https://api.waqi.info/feed")
-    api_timeout = CONFIG.get('api_timeout_seconds', 10)
-
-    if not AQICN_TOKEN: 
+    token = _get_token()
+    if not token: 
         msg = "AQICN_API_TOKEN not found. Please set it in .env or environment variables."
         log.error(msg)
         raise APIKeyError(msg, service="AQICN")
-    if not aqicn_base_url:
-         msg = "AQICN base URL not found in configuration (config.yaml)."
-         log.error(msg)
-         raise ConfigError(msg)
 
-    api_url = f"{aqicn_base_url}/{city_name_query}/?token={AQICN_TOKEN}"
-    log.info(f"Requesting data from AQICN API: {aqicn_base_url}/{city_name_query}/?token=***TOKEN_HIDDEN***")
+    # The city is percent-encoded as one path segment; the token goes in the query params,
+    # so the URL (and every message that includes it) never contains it.
+    api_url = _URL_PREFIX + quote(city_name_query, safe='') + '/'
+    log.info(f"Requesting data from AQICN API: {api_url}")
 
     try:
-        response = requests.get(api_url, timeout=api_timeout)
+        conditional_headers = {}
+        if cached is not None:
+            if cached.etag:
+                conditional_headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                conditional_headers['If-Modified-Since'] = cached.last_modified
+        response = _SESSION.get(api_url, params={'token': token}, headers=conditional_headers, timeout=_API_TIMEOUT)
+        if response.status_code == 304 and cached is not None:
+            log.info(f"AQICN data for '{city_name_query}' not modified; reusing cached response.")
+            return (cached.data, response.headers.get('ETag', cached.etag),
+                    response.headers.get('Last-Modified', cached.last_modified))
         response.raise_for_status() 
-        data = response.json()
-        
+        log.debug(f"AQICN response for '{city_name_query}': Content-Encoding={response.headers.get('Content-Encoding')}, {len(response.content)} bytes decoded.")
+        data = _json_loads(response.content)
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
 
         if data.get("status") == "ok":
             log.info(f"Successfully received 'ok' status from AQICN for '{city_name_query}'.")
-            return data
+            return data, etag, last_modified
         elif data.get("status") == "error":
             error_message = data.get("data", "Unknown API error reason")
             log.error(f"AQICN API returned error status for '{city_name_query}': {error_message}")
             if "Unknown station" in str(error_message):
                  log.warning(f"City/Station '{city_name_query}' resulted in 'Unknown station' from AQICN API.")
-                 return None 
+                 return None, None, None
             raise APIError(f"AQICN API error: {error_message}", service="AQICN")
         else:
             msg = f"Received unexpected/missing status from AQICN for '{city_name_query}': {data.get('status', 'Status not present')}"
@@ -149,14 +336,74 @@ def get_city_aqi_data(city_name_query):
 
 
 # --- Wrapper Functions & Helpers ---
+# Placeholder values stations report instead of an AQI reading.
+_AQI_MISSING_SENTINELS = frozenset({'', '-', 'N/A', 'na', '—'})
+
+@lru_cache(maxsize=256)
 def _extract_city_for_aqicn(city_name_full):
     """Helper to get just the city name part if 'City, Country' is passed."""
-    return city_name_full.split(',')[0].strip()
+    return city_name_full.split(',', 1)[0].strip()
+
+# The response fields the wrappers use. `station` is None if the station name is not reported.
+_AQICNView = namedtuple("_AQICNView", ("aqi", "station", "time", "iaqi", "stale"))
+
+def _parse_aqicn_payload(full_data_response):
+    """Extracts the wrapper fields from a `get_city_aqi_data` response in one pass."""
+    api_data = full_data_response.get("data", {})
+    return _AQICNView(
+        aqi=api_data.get("aqi"),
+        station=api_data.get("city", {}).get("name"),
+        time=api_data.get("time", {}).get("s"),
+        iaqi=api_data.get("iaqi"),
+        stale=bool(full_data_response.get('_stale')),
+    )
+
+def _get_city_view(city_query):
+    """
+    Fetches a city via `get_city_aqi_data` and returns its parsed view.
+
+    Returns:
+        _AQICNView | None: The view (reused from the cache entry when the response
+            came from the cache), or None if AQICN reports an unknown station.
+    """
+    full_data_response = get_city_aqi_data(city_query)
+    if full_data_response is None:
+        return None
+    with _CACHE_LOCK:
+        entry = _CACHE.get(city_query.lower())
+    if entry is not None and entry.data is full_data_response:
+        return entry.view
+    return _parse_aqicn_payload(full_data_response)
+
+def _mark_stale(result, view):
+    """Adds 'stale': True to a wrapper result built from a stale cached response."""
+    if view.stale:
+        result['stale'] = True
+    return result
 
 def _create_error_dict_current_aqi(city_name_part, error_message, station_name="Error"):
     """Standardized error dictionary for get_current_aqi_for_city."""
     return {'city': city_name_part, 'aqi': None, 'station': station_name, 'time': None, 'error': error_message}
 
+def _current_aqi_from_view(city_query, view):
+    """Builds the `get_current_aqi_for_city` result from a `_get_city_view` result."""
+    if view is None:
+         return _create_error_dict_current_aqi(city_query, "Station not found by AQICN.", station_name="Unknown station")
+
+    aqi_raw = view.aqi
+    station_name_reported = view.station if view.station is not None else city_query
+    timestamp_reported = view.time
+
+    # The API normally reports an int, which needs no string normalization.
+    if type(aqi_raw) is int:
+        return _mark_stale({"city": city_query, "aqi": aqi_raw, "station": station_name_reported, "time": timestamp_reported}, view)
+
+    if ('' if aqi_raw is None else str(aqi_raw).strip()) in _AQI_MISSING_SENTINELS:
+        log.warning(f"AQI value missing or N/A for '{city_query}'. Raw: '{aqi_raw}'")
+        return _create_error_dict_current_aqi(city_query, "AQI value not reported by station.", station_name=station_name_reported)
+
+    return _mark_stale({"city": city_query, "aqi": int(aqi_raw), "station": station_name_reported, "time": timestamp_reported}, view)
+
 def get_current_aqi_for_city(city_name_full): 
     """
     Fetches and extracts the current AQI for a given city.
@@ -175,21 +422,7 @@ def get_current_aqi_for_city(city_name_full):
     city_query = _extract_city_for_aqicn(city_name_full)
     log.info(f"Getting current AQI (Sec 3) for '{city_name_full}' (querying AQICN as '{city_query}')")
     try:
-        full_data_response = get_city_aqi_data(city_query)
-        if full_data_response is None: 
-             return _create_error_dict_current_aqi(city_query, "Station not found by AQICN.", station_name="Unknown station")
-
-        api_data = full_data_response.get("data", {})
-        aqi_raw = api_data.get("aqi")
-        station_name_reported = api_data.get("city", {}).get("name", city_query)
-        timestamp_reported = api_data.get("time", {}).get("s")
-        
-        if aqi_raw is None or str(aqi_raw).strip() == '' or str(aqi_raw).strip() == '-':
-            log.warning(f"AQI value missing or N/A for '{city_query}'. Raw: '{aqi_raw}'")
-            return _create_error_dict_current_aqi(city_query, "AQI value not reported by station.", station_name=station_name_reported)
-        
-        return {"city": city_query, "aqi": int(aqi_raw), "station": station_name_reported, "time": timestamp_reported}
-        
+        return _current_aqi_from_view(city_query, _get_city_view(city_query))
     except (APIKeyError, ConfigError, APITimeoutError, APINotFoundError, APIError, ValueError) as e:
          log.error(f"Handled API exception for current AQI of '{city_name_full}': {e}")
          return _create_error_dict_current_aqi(city_query, f"API Error: {str(e)}")
@@ -198,9 +431,46 @@ def get_current_aqi_for_city(city_name_full):
          return _create_error_dict_current_aqi(city_query, "Unexpected internal error.")
 
 
+def get_current_aqi_for_cities(city_names_full):
+    """
+    Fetches the current AQI for several cities concurrently.
+
+    Each city is fetched with `get_current_aqi_for_city` on its own worker
+    thread, sharing the pooled Session, so the total wait is roughly that of
+    the slowest city rather than the sum of all of them.
+
+    Args:
+        city_names_full (list[str]): City names in "City, Country" format.
+
+    Returns:
+        list[dict]: One `get_current_aqi_for_city` result per city, in input order.
+    """
+    city_names_full = list(city_names_full)
+    if len(city_names_full) <= 1:
+        return [get_current_aqi_for_city(city) for city in city_names_full]
+    with ThreadPoolExecutor(max_workers=min(len(city_names_full), _POOL_MAXSIZE),
+                            thread_name_prefix="aqicn-fetch") as executor:
+        return list(executor.map(get_current_aqi_for_city, city_names_full))
+
+
 def _create_error_dict_pollutant_risks(city_name_part, error_message):
     return {'city': city_name_part, 'time': None, 'pollutants': {}, 'risks': [], 'error': error_message}
 
+def _pollutant_risks_from_view(city_query, view):
+    """Builds the `get_current_pollutant_risks_for_city` result from a `_get_city_view` result."""
+    if view is None:
+         return _create_error_dict_pollutant_risks(city_query, "Station not found by AQICN.")
+
+    iaqi_data = view.iaqi
+    timestamp_reported = view.time
+
+    if iaqi_data and timestamp_reported:
+        risk_list = interpret_pollutant_risks(iaqi_data)
+        return _mark_stale({"city": city_query, "time": timestamp_reported, "pollutants": iaqi_data, "risks": risk_list}, view)
+    else:
+        log.error(f"Could not extract 'iaqi' or 'time' for risk interpretation for '{city_query}'.")
+        return _create_error_dict_pollutant_risks(city_query, 'Pollutant data or timestamp missing.')
+
 def get_current_pollutant_risks_for_city(city_name_full):
     """
     Fetches pollutant data and interprets their health risks.
@@ -218,20 +488,7 @@ def get_current_pollutant_risks_for_city(city_name_full):
     city_query = _extract_city_for_aqicn(city_name_full)
     log.info(f"Getting current pollutant risks (Sec 5) for '{city_name_full}' (querying AQICN as '{city_query}')")
     try:
-        full_data_response = get_city_aqi_data(city_query)
-        if full_data_response is None:
-             return _create_error_dict_pollutant_risks(city_query, "Station not found by AQICN.")
-
-        api_data = full_data_response.get("data", {})
-        iaqi_data = api_data.get("iaqi")
-        timestamp_reported = api_data.get("time", {}).get("s")
-
-        if iaqi_data and timestamp_reported:
-            risk_list = interpret_pollutant_risks(iaqi_data)
-            return {"city": city_query, "time": timestamp_reported, "pollutants": iaqi_data, "risks": risk_list}
-        else:
-            log.error(f"Could not extract 'iaqi' or 'time' for risk interpretation for '{city_query}'.")
-            return _create_error_dict_pollutant_risks(city_query, 'Pollutant data or timestamp missing.')
+        return _pollutant_risks_from_view(city_query, _get_city_view(city_query))
     except (APIKeyError, ConfigError, APITimeoutError, APINotFoundError, APIError, ValueError) as e:
          log.error(f"Handled API exception for pollutant risks of '{city_name_full}': {e}")
          return _create_error_dict_pollutant_risks(city_query, f"API Error: {str(e)}")
@@ -240,6 +497,39 @@ def get_current_pollutant_risks_for_city(city_name_full):
          return _create_error_dict_pollutant_risks(city_query, 'Unexpected internal error.')
 
 
+
+def get_city_snapshot(city_name_full):
+    """
+    Fetches a city's AQICN data once and returns both the current-AQI and pollutant-risk views.
+
+    Callers that need both views should use this instead of calling
+    `get_current_aqi_for_city` and `get_current_pollutant_risks_for_city`
+    separately.
+
+    Args:
+        city_name_full (str): The city name, typically in "City, Country" format.
+
+    Returns:
+        dict: {'aqi_info': <get_current_aqi_for_city result>,
+               'risks_info': <get_current_pollutant_risks_for_city result>};
+              on failure both entries are the standard error dictionaries.
+    """
+    city_query = _extract_city_for_aqicn(city_name_full)
+    log.info(f"Getting AQI snapshot for '{city_name_full}' (querying AQICN as '{city_query}')")
+    try:
+        view = _get_city_view(city_query)
+        return {'aqi_info': _current_aqi_from_view(city_query, view),
+                'risks_info': _pollutant_risks_from_view(city_query, view)}
+    except (APIKeyError, ConfigError, APITimeoutError, APINotFoundError, APIError, ValueError) as e:
+         log.error(f"Handled API exception for AQI snapshot of '{city_name_full}': {e}")
+         error_message = f"API Error: {str(e)}"
+    except Exception as e:
+         log.error(f"Unexpected error getting AQI snapshot for '{city_name_full}': {e}", exc_info=True)
+         error_message = "Unexpected internal error."
+    return {'aqi_info': _create_error_dict_current_aqi(city_query, error_message),
+            'risks_info': _create_error_dict_pollutant_risks(city_query, error_message)}
+
+
 # --- Example Usage / Direct Execution ---
 if __name__ == "__main__":
     if not logging.getLogger().hasHandlers():
@@ -302,7 +592,7 @@ if __name__ == "__main__":
     print("  (To fully test APIKeyError, temporarily remove/comment AQICN_API_TOKEN in .env and re-run this script)")
     print("  Attempting call with (potentially) missing token to see if APIKeyError is raised by get_city_aqi_data...")
     
-    if not AQICN_TOKEN:
+    if not _get_token():
         try:
             get_city_aqi_data("Delhi") 
             print("  FAILURE (API Key Test): Expected APIKeyError, but no exception was raised.")
@@ -13,12 +13,26 @@ Dependencies:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import logging
 from dotenv import load_dotenv
 import sys
 import json
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+
+# orjson parses response bodies several times faster than the stdlib decoder.
+# Its JSONDecodeError subclasses ValueError, like json's, so error handling is unchanged.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # --- Setup Project Root Path ---
 try:
@@ -89,71 +103,217 @@ WEATHERAPI_API_KEY = os.getenv('WEATHERAPI_API_KEY')
 WEATHERAPI_CURRENT_URL_CFG = CONFIG.get('apis', {}).get('weatherapi', {}).get('base_url', "http://api.weatherapi.com/v1/current.json")
 WEATHERAPI_FORECAST_URL_CFG = CONFIG.get('apis', {}).get('weatherapi', {}).get('forecast_url', "http://api.weatherapi.com/v1/forecast.json")
 API_TIMEOUT_CFG = CONFIG.get('api_timeout_seconds', 10)
+# Largest response body accepted; a bigger one is abandoned instead of being buffered and parsed.
+MAX_RESPONSE_BYTES = CONFIG.get('apis', {}).get('weatherapi', {}).get('max_response_bytes', 2_000_000)
 DEFAULT_RETRIES = CONFIG.get('api_retries', {}).get('default', 2)
 DEFAULT_RETRY_DELAY = CONFIG.get('api_retry_delay_seconds', {}).get('default', 1)
+_CURRENT_RETRIES = CONFIG.get('api_retries', {}).get('weather_api_current', DEFAULT_RETRIES)
+_CURRENT_DELAY = CONFIG.get('api_retry_delay_seconds', {}).get('weather_api_current', DEFAULT_RETRY_DELAY)
+_FORECAST_RETRIES = CONFIG.get('api_retries', {}).get('weather_api_forecast', DEFAULT_RETRIES)
+_FORECAST_DELAY = CONFIG.get('api_retry_delay_seconds', {}).get('weather_api_forecast', DEFAULT_RETRY_DELAY)
+# Fixed query parameters of each endpoint; requests add 'key', 'q' (and 'days').
+_BASE_PARAMS_CURRENT = {'aqi': 'no'}
+_BASE_PARAMS_FORECAST = {'aqi': 'no', 'alerts': 'no'}
+# Retry delays grow as delay * 2**attempt, stretched by up to JITTER so clients
+# retrying together spread out, and are capped at MAX_DELAY seconds.
+MAX_DELAY = CONFIG.get('api_retry_max_delay_seconds', 30)
+JITTER = CONFIG.get('api_retry_jitter', 0.5)
+# Wall-clock budget for one request including all retries: a retry whose backoff
+# would overrun it is not attempted, and each attempt's timeout is trimmed to fit.
+TOTAL_DEADLINE_S = CONFIG.get('api_total_deadline_seconds', 30)
+
+# --- Shared HTTP Session ---
+# Current and forecast requests go to the same host, so one pooled Session lets
+# them reuse a kept-alive connection instead of a new TCP/TLS handshake per call.
+# Retries stay with _make_weatherapi_request, so the adapters do not retry.
+_POOL_MAXSIZE = 20
+_SESSION = requests.Session()
+for _scheme in ("http://", "https://"):
+    _SESSION.mount(_scheme, HTTPAdapter(pool_connections=4, pool_maxsize=_POOL_MAXSIZE))
+_SESSION.headers.update({'User-Agent': 'BreatheEasy-WeatherClient', 'Accept': 'application/json'})
+
+
+def close_weather_session():
+    """Closes the pooled connections of the shared WeatherAPI session (e.g., on shutdown)."""
+    _SESSION.close()
+
+# --- Response Cache ---
+# Processed results per query, as {key: (expires_at, value)}. Current conditions
+# and daily forecasts change slowly, so repeat queries for a city are served
+# from memory. An unknown city (None) is cached briefly, so a typo is not
+# re-sent on every refresh but a later fix to the API side is still picked up.
+CACHE_TTL_CURRENT = CONFIG.get('cache_ttl', {}).get('weather_current', 900)
+CACHE_TTL_FORECAST = CONFIG.get('cache_ttl', {}).get('weather_forecast', 3600)
+CACHE_TTL_NOT_FOUND = CONFIG.get('cache_ttl', {}).get('weather_not_found', 60)
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+_CACHE_MISS = object()
+
+
+def _cache_get(key):
+    """Returns the cached value for `key`, or _CACHE_MISS if absent or expired."""
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return _CACHE_MISS
+    return entry[1]
+
+
+def _cache_set(key, value, ttl):
+    """Caches `value` under `key` for `ttl` seconds."""
+    with _CACHE_LOCK:
+        _CACHE[key] = (time.monotonic() + ttl, value)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_city(city_name):
+    """Cache-key form of a city name: lower-cased, with whitespace runs collapsed and trimmed."""
+    return " ".join(city_name.lower().split())
+
+
+def clear_weather_cache():
+    """Drops all cached WeatherAPI results."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def _backoff_delay(retry_delay_cfg, attempt, retry_after=None):
+    """
+    Returns the seconds to wait before the next retry.
+
+    Args:
+        retry_delay_cfg (float): Base delay from the configuration.
+        attempt (int): Zero-based index of the attempt that just failed.
+        retry_after (str | None): The response's Retry-After header, if any.
+            When it parses (seconds or an HTTP date), it is used instead of the
+            exponential backoff.
+    """
+    if retry_after:
+        try:
+            return min(MAX_DELAY, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                return min(MAX_DELAY, max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time()))
+            except (TypeError, ValueError):
+                pass
+    return min(MAX_DELAY, retry_delay_cfg * (2 ** attempt) * (1 + random.uniform(0, JITTER)))
+
+def _read_body_limited(response, context, city_name_for_log):
+    """
+    Reads a streamed response body, giving up once it exceeds MAX_RESPONSE_BYTES.
+
+    Raises:
+        APIError: If the declared Content-Length or the bytes received exceed the limit.
+    """
+    declared = response.headers.get('Content-Length')
+    if declared and declared.isdigit() and int(declared) > MAX_RESPONSE_BYTES:
+        response.close()
+        raise APIError(f"Response too large for {context} query: '{city_name_for_log}' ({declared} bytes declared).", service="WeatherAPI")
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=65536):
+        body += chunk
+        if len(body) > MAX_RESPONSE_BYTES:
+            response.close()
+            raise APIError(f"Response too large for {context} query: '{city_name_for_log}' (over {MAX_RESPONSE_BYTES} bytes).", service="WeatherAPI")
+    return bytes(body)
+
+# --- Error Dispatch ---
+# HTTP error statuses map to handlers returning (action, value): ("retry", exception)
+# to try again while attempts remain, ("raise", exception) to fail now, or
+# ("return", value) to return `value` from the request. Unlisted statuses use
+# _status_other, which retries 5xx and 429.
+def _status_bad_request(status, resp_text, context, city_name_for_log, url):
+    if "no matching location found" in resp_text.lower():
+        return "return", None
+    return _status_other(status, resp_text, context, city_name_for_log, url)
+
+def _status_unauthorized(status, resp_text, context, city_name_for_log, url):
+    return "raise", APIKeyError(f"Auth (401) for {context} query: '{city_name_for_log}'. Check key.", service="WeatherAPI")
+
+def _status_forbidden(status, resp_text, context, city_name_for_log, url):
+    return "raise", APIError(f"Forbidden (403) for {context} query: '{city_name_for_log}'.", status_code=403, service="WeatherAPI")
+
+def _status_not_found(status, resp_text, context, city_name_for_log, url):
+    return "raise", APINotFoundError(f"Endpoint not found (404) for URL: {url}", service="WeatherAPI")
+
+def _status_other(status, resp_text, context, city_name_for_log, url):
+    action = "retry" if 500 <= status <= 599 or status == 429 else "raise"
+    return action, APIError(f"HTTP error {status} for {context} query: '{city_name_for_log}'.", status_code=status, service="WeatherAPI")
+
+_STATUS_HANDLERS = {400: _status_bad_request, 401: _status_unauthorized, 403: _status_forbidden, 404: _status_not_found}
+
+# WeatherAPI error codes reported in the JSON body of an otherwise successful response.
+_LOCATION_NOT_FOUND_CODE = 1006
+_KEY_ERROR_CODES = frozenset({1002, 1003, 1005, 2006, 2007, 2008})
 
 def _make_weatherapi_request(url, params, city_name_for_log, max_retries_cfg, retry_delay_cfg, context="request"):
     """
     Internal function to make a request to the WeatherAPI with retry logic.
-    Handles various exceptions and retries on 5xx server errors and timeouts.
+    Handles various exceptions and retries on 5xx server errors, 429 rate limits
+    and timeouts, with exponential backoff and jitter between attempts, all
+    within TOTAL_DEADLINE_S seconds.
     """
+    deadline = time.monotonic() + TOTAL_DEADLINE_S
     last_exception = None
     for attempt in range(max_retries_cfg + 1):
+        is_last_attempt = attempt == max_retries_cfg
+        body = None
+        retry_after = None
         try:
             log.debug(f"Attempt {attempt + 1}/{max_retries_cfg+1} for {context} ({city_name_for_log}) to URL: {url}")
-            response = requests.get(url, params=params, timeout=API_TIMEOUT_CFG)
-            response.raise_for_status()
-            data = response.json()
-            if "error" in data:
+            timeout = min(API_TIMEOUT_CFG, max(0.1, deadline - time.monotonic()))
+            response = _SESSION.get(url, params=params, timeout=timeout, stream=True)
+            status = response.status_code
+            if status < 400:
+                body = _read_body_limited(response, context, city_name_for_log)
+                data = _json_loads(body)
+                if "error" not in data:
+                    return data
                 err_info = data["error"]; err_msg = err_info.get('message', f'Unknown API error for {context}'); err_code = err_info.get('code')
                 log.error(f"WeatherAPI JSON error ({context}) for '{city_name_for_log}' (Code: {err_code}): {err_msg}")
-                if err_code == 1006: 
+                if err_code == _LOCATION_NOT_FOUND_CODE:
                     return None
-                elif err_code in [1002,1003,1005,2006,2007,2008]: raise APIKeyError(f"Code {err_code}: {err_msg}", service="WeatherAPI")
-                else: 
-                    base_msg_for_exception = f"HTTP error {status_code} encountered for {context} query on '{city_name_for_log}'."
-                    log.error(f"WeatherAPI: {base_msg_for_exception} Original HTTPError detail: {str(http_err)}. Resp: {response_text_snippet}")
-                    raise APIError(base_msg_for_exception, status_code=status_code, service="WeatherAPI") from http_err
-            return data
-        except requests.exceptions.HTTPError as http_err:
-            status = http_err.response.status_code if http_err.response else 0
-            resp_text = http_err.response.text[:100] if http_err.response and hasattr(http_err.response, 'text') else "N/A"
-            error_lines = str(http_err).splitlines()
-            detail = error_lines[0] if error_lines else str(http_err)
-            core_msg = f"HTTP error {status} for {context} query: '{city_name_for_log}'. Detail: {detail}"
-
-            if 500 <= status <= 599 and attempt < max_retries_cfg:
-                log.warning(f"{core_msg} (attempt {attempt+1}). Retrying in {retry_delay_cfg}s. Resp: {resp_text}")
-                last_exception = APIError(core_msg, status_code=status, service="WeatherAPI")
-                time.sleep(retry_delay_cfg); continue
-            else:
-                log.error(f"Final/Non-retry {core_msg}. Resp: {resp_text}")
-                if status == 401: raise APIKeyError(f"Auth (401) for {context} query: '{city_name_for_log}'. Check key.", service="WeatherAPI") from http_err
-                elif status == 403: raise APIError(f"Forbidden (403) for {context} query: '{city_name_for_log}'.", status_code=403, service="WeatherAPI") from http_err
-                elif status == 400 and "no matching location found" in resp_text.lower(): return None
-                elif status == 404: raise APINotFoundError(f"Endpoint not found (404) for URL: {url}", service="WeatherAPI") from http_err
-                else: 
-                    clean_core_msg = f"HTTP error {status} for {context} query: '{city_name_for_log}'." 
-                    log.error(f"WeatherAPI: Raising APIError with: {clean_core_msg} Original HTTPError: {str(http_err)}. Resp: {resp_text}") 
-                    raise APIError(clean_core_msg, status_code=status, service="WeatherAPI") from http_err 
+                if err_code in _KEY_ERROR_CODES:
+                    raise APIKeyError(f"Code {err_code}: {err_msg}", service="WeatherAPI")
+                raise APIError(f"Code {err_code}: {err_msg} ({context} query on '{city_name_for_log}').", service="WeatherAPI")
+
+            resp_text = _read_body_limited(response, context, city_name_for_log)[:100].decode('utf-8', errors='replace')
+            action, outcome = _STATUS_HANDLERS.get(status, _status_other)(status, resp_text, context, city_name_for_log, url)
+            if action == "return":
+                log.warning(f"HTTP error {status} for {context} query: '{city_name_for_log}' treated as no result. Resp: {resp_text}")
+                return outcome
+            if action == "raise" or is_last_attempt:
+                log.error(f"Final/Non-retry HTTP error {status} for {context} query: '{city_name_for_log}'. Resp: {resp_text}")
+                raise outcome
+            log.warning(f"HTTP error {status} for {context} query: '{city_name_for_log}' (attempt {attempt+1}). Retrying. Resp: {resp_text}")
+            last_exception = outcome
+            if status == 429:
+                retry_after = response.headers.get('Retry-After')
         except requests.exceptions.Timeout as e_timeout:
             core_msg = f"Request timed out for {context}: '{city_name_for_log}'"
-            if attempt < max_retries_cfg: log.warning(f"{core_msg} (attempt {attempt+1}). Retrying..."); last_exception = APITimeoutError(core_msg, service="WeatherAPI"); time.sleep(retry_delay_cfg); continue
-            else: log.error(f"Final timeout. {core_msg}"); raise APITimeoutError(core_msg, service="WeatherAPI") from e_timeout
+            if is_last_attempt: log.error(f"Final timeout. {core_msg}"); raise APITimeoutError(core_msg, service="WeatherAPI") from e_timeout
+            log.warning(f"{core_msg} (attempt {attempt+1}). Retrying..."); last_exception = APITimeoutError(core_msg, service="WeatherAPI")
         except requests.exceptions.RequestException as e_req:
             core_msg = f"Network error for {context}: {e_req}"
-            if attempt < max_retries_cfg: log.warning(f"{core_msg} (attempt {attempt+1}). Retrying..."); last_exception = APIError(core_msg, service="WeatherAPI"); time.sleep(retry_delay_cfg); continue
-            else: log.error(f"Final network error. {core_msg}"); raise APIError(core_msg, service="WeatherAPI") from e_req
-        except (json.JSONDecodeError, ValueError) as json_e:
-            response_text = response.text[:100] if 'response' in locals() and hasattr(response, 'text') else 'N/A'
+            if is_last_attempt: log.error(f"Final network error. {core_msg}"); raise APIError(core_msg, service="WeatherAPI") from e_req
+            log.warning(f"{core_msg} (attempt {attempt+1}). Retrying..."); last_exception = APIError(core_msg, service="WeatherAPI")
+        except (APIKeyError, APINotFoundError, APIError):
+            raise
+        except ValueError as json_e:
+            response_text = body[:100].decode('utf-8', errors='replace') if body is not None else 'N/A'
             msg = f"Invalid data format from WeatherAPI ({context}) for '{city_name_for_log}': {str(json_e)}. Response snippet: {response_text}"
             log.error(msg); raise ValueError(msg) from json_e
-        except (APIKeyError, APINotFoundError, APIError) as specific_error: 
-            raise specific_error
         except Exception as e_general:
             core_msg = f"Unexpected error for {context}: {e_general}"
-            if attempt < max_retries_cfg: log.error(f"{core_msg} (attempt {attempt+1}). Retrying...", exc_info=True); last_exception = APIError(core_msg, service="WeatherAPI"); time.sleep(retry_delay_cfg); continue
-            else: log.error(f"Final unexpected error. {core_msg}", exc_info=True); raise APIError(core_msg, service="WeatherAPI") from e_general
+            if is_last_attempt: log.error(f"Final unexpected error. {core_msg}", exc_info=True); raise APIError(core_msg, service="WeatherAPI") from e_general
+            log.error(f"{core_msg} (attempt {attempt+1}). Retrying...", exc_info=True); last_exception = APIError(core_msg, service="WeatherAPI")
+
+        delay = _backoff_delay(retry_delay_cfg, attempt, retry_after)
+        if delay >= deadline - time.monotonic():
+            log.error(f"Giving up on {context} ({city_name_for_log}): a retry in {delay:.2f}s would exceed the {TOTAL_DEADLINE_S}s budget.")
+            raise last_exception or APITimeoutError(f"Deadline exceeded for {context}: '{city_name_for_log}'", service="WeatherAPI")
+        log.debug(f"Waiting {delay:.2f}s before retrying {context} ({city_name_for_log}).")
+        time.sleep(delay)
     if last_exception: 
         raise last_exception
     return None
@@ -162,6 +322,9 @@ def get_current_weather(city_name):
     """
     Fetches the current weather for a specified city.
 
+    Results are cached per city for CACHE_TTL_CURRENT seconds (unknown cities
+    for CACHE_TTL_NOT_FOUND); errors are never cached.
+
     Args:
         city_name (str): The name of the city to query (e.g., "Delhi, India").
 
@@ -171,19 +334,60 @@ def get_current_weather(city_name):
     """
     if not WEATHERAPI_API_KEY: raise APIKeyError("WEATHERAPI_API_KEY missing.", service="WeatherAPI")
     if not WEATHERAPI_CURRENT_URL_CFG: raise ConfigError("WeatherAPI current base URL missing.")
-    current_retries = CONFIG.get('api_retries', {}).get('weather_api_current', DEFAULT_RETRIES)
-    current_delay = CONFIG.get('api_retry_delay_seconds', {}).get('weather_api_current', DEFAULT_RETRY_DELAY)
-    params = {'key': WEATHERAPI_API_KEY, 'q': city_name, 'aqi': 'no'}
-    data = _make_weatherapi_request(WEATHERAPI_CURRENT_URL_CFG, params, city_name, current_retries, current_delay, "current weather")
-    if data is None: return None
+    cache_key = ("current", _normalize_city(city_name))
+    cached = _cache_get(cache_key)
+    if cached is not _CACHE_MISS:
+        log.debug(f"Using cached current weather for '{city_name}'.")
+        return cached
+    params = {**_BASE_PARAMS_CURRENT, 'key': WEATHERAPI_API_KEY, 'q': city_name}
+    data = _make_weatherapi_request(WEATHERAPI_CURRENT_URL_CFG, params, city_name, _CURRENT_RETRIES, _CURRENT_DELAY, "current weather")
+    if data is None:
+        _cache_set(cache_key, None, CACHE_TTL_NOT_FOUND)
+        return None
     current = data.get("current", {}); loc = data.get("location", {}); cond = current.get("condition", {}) 
     if not current or not loc: raise APIError(f"Missing 'current'/'location' for {city_name}", service="WeatherAPI")
-    return {"temp_c": current.get("temp_c"), "feelslike_c": current.get("feelslike_c"), "humidity": current.get("humidity"), "pressure_mb": current.get("pressure_mb"), "condition_text": cond.get("text"), "condition_icon": cond.get("icon"), "wind_kph": current.get("wind_kph"), "wind_dir": current.get("wind_dir"), "uv_index": current.get("uv"), "city": loc.get("name"), "region": loc.get("region"), "country": loc.get("country"), "last_updated": current.get("last_updated"), "localtime": loc.get("localtime")}
+    result = {"temp_c": current.get("temp_c"), "feelslike_c": current.get("feelslike_c"), "humidity": current.get("humidity"), "pressure_mb": current.get("pressure_mb"), "condition_text": cond.get("text"), "condition_icon": cond.get("icon"), "wind_kph": current.get("wind_kph"), "wind_dir": current.get("wind_dir"), "uv_index": current.get("uv"), "city": loc.get("name"), "region": loc.get("region"), "country": loc.get("country"), "last_updated": current.get("last_updated"), "localtime": loc.get("localtime")}
+    _cache_set(cache_key, result, CACHE_TTL_CURRENT)
+    return result
+
+def get_current_weather_many(city_names):
+    """
+    Fetches the current weather for several cities concurrently.
+
+    Each city is fetched with `get_current_weather` on its own worker thread,
+    sharing the pooled Session and the response cache, so the total wait is
+    roughly that of the slowest city rather than the sum of all of them.
+
+    Args:
+        city_names (list[str]): City names to query.
+
+    Returns:
+        dict: {city_name: result} in input order, where result is the
+              `get_current_weather` dict, or None if the city was not found or
+              its request failed (the error is logged).
+    """
+    city_names = list(dict.fromkeys(city_names))
+
+    def fetch(city_name):
+        try:
+            return get_current_weather(city_name)
+        except (APIKeyError, ConfigError, APITimeoutError, APINotFoundError, APIError, ValueError) as e:
+            log.error(f"Current weather failed for '{city_name}': {e}")
+            return None
+
+    if len(city_names) <= 1:
+        return {city_name: fetch(city_name) for city_name in city_names}
+    with ThreadPoolExecutor(max_workers=min(len(city_names), _POOL_MAXSIZE),
+                            thread_name_prefix="weather-fetch") as executor:
+        return dict(zip(city_names, executor.map(fetch, city_names)))
 
 def get_weather_forecast(city_name, days=3):
     """
     Fetches a multi-day weather forecast for a specified city.
 
+    Results are cached per city and day count for CACHE_TTL_FORECAST seconds
+    (unknown cities for CACHE_TTL_NOT_FOUND); errors are never cached.
+
     Args:
         city_name (str): The name of the city to query.
         days (int): The number of forecast days to retrieve (1-14).
@@ -195,19 +399,25 @@ def get_weather_forecast(city_name, days=3):
     """
     if not WEATHERAPI_API_KEY: raise APIKeyError("WEATHERAPI_API_KEY missing.", service="WeatherAPI")
     if not WEATHERAPI_FORECAST_URL_CFG: raise ConfigError("WeatherAPI forecast URL missing.")
-    forecast_retries = CONFIG.get('api_retries', {}).get('weather_api_forecast', DEFAULT_RETRIES)
-    forecast_delay = CONFIG.get('api_retry_delay_seconds', {}).get('weather_api_forecast', DEFAULT_RETRY_DELAY)
 
     days = max(1, min(days, 14))
-    params = {'key': WEATHERAPI_API_KEY, 'q': city_name, 'days': days, 'aqi': 'no', 'alerts': 'no'}
-    data = _make_weatherapi_request(WEATHERAPI_FORECAST_URL_CFG, params, city_name, forecast_retries, forecast_delay, "weather forecast")
-    if data is None: return None
+    cache_key = ("forecast", _normalize_city(city_name), days)
+    cached = _cache_get(cache_key)
+    if cached is not _CACHE_MISS:
+        log.debug(f"Using cached {days}-day forecast for '{city_name}'.")
+        return cached
+    params = {**_BASE_PARAMS_FORECAST, 'key': WEATHERAPI_API_KEY, 'q': city_name, 'days': days}
+    data = _make_weatherapi_request(WEATHERAPI_FORECAST_URL_CFG, params, city_name, _FORECAST_RETRIES, _FORECAST_DELAY, "weather forecast")
+    if data is None:
+        _cache_set(cache_key, None, CACHE_TTL_NOT_FOUND)
+        return None
     fc_days_data = data.get("forecast", {}).get("forecastday", [])
     if not fc_days_data: log.warning(f"No 'forecastday' data for {city_name}"); return None
     processed_fc = []
     for day_data in fc_days_data:
         day_info = day_data.get("day", {}); cond_info = day_info.get("condition", {}) 
         processed_fc.append({"date": day_data.get("date"), "avgtemp_c": day_info.get("avgtemp_c"), "avghumidity": day_info.get("avghumidity"), "maxwind_kph": day_info.get("maxwind_kph"), "totalprecip_mm": day_info.get("totalprecip_mm"), "uv": day_info.get("uv"), "condition_text": cond_info.get("text")})
+    _cache_set(cache_key, processed_fc, CACHE_TTL_FORECAST)
     return processed_fc
 
 
@@ -4,8 +4,18 @@
 Provides functions to calculate the Air Quality Index (AQI) from raw
 pollutant concentrations based on the Indian CPCB NAQI standard.
 """
+from bisect import bisect_left
+
+import numpy as np
 import pandas as pd
 
+# Numba is optional: without it, calculate_sub_index_fast is calculate_sub_index.
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 POLLUTANT_BREAKPOINTS = {
     'pm10': [(0, 50, 0, 50), (51, 100, 51, 100), (101, 250, 101, 200), (251, 350, 201, 300), (351, 430, 301, 400), (431, float('inf'), 401, 500)],
     'pm25': [(0, 30, 0, 50), (31, 60, 51, 100), (61, 90, 101, 200), (91, 120, 201, 300), (121, 250, 301, 400), (251, float('inf'), 401, 500)],
@@ -16,34 +26,152 @@ POLLUTANT_BREAKPOINTS = {
     'nh3': [(0, 200, 0, 50), (201, 400, 51, 100), (401, 800, 101, 200), (801, 1200, 201, 300), (1201, 1800, 301, 400), (1801, float('inf'), 401, 500)],
 }
 
+# Column-wise copies of POLLUTANT_BREAKPOINTS for the vectorized path:
+# pollutant -> (bp_low, bp_high, aqi_low, aqi_high) float arrays, one entry per band.
+_BREAKPOINT_ARRAYS = {
+    pollutant: tuple(np.array(column, dtype=float) for column in zip(*bands))
+    for pollutant, bands in POLLUTANT_BREAKPOINTS.items()
+}
+# All bands as one float array of shape (pollutants, bands, 4) for the Numba
+# kernel, with each pollutant's row number in _POLLUTANT_INDEX.
+_POLLUTANT_INDEX = {pollutant: i for i, pollutant in enumerate(POLLUTANT_BREAKPOINTS)}
+_BP_MATRIX = np.array([bands for bands in POLLUTANT_BREAKPOINTS.values()], dtype=np.float64)
+# Band upper bounds per pollutant as plain lists, for bisect in the scalar path
+# (cheaper than a NumPy call for a single value).
+_BAND_HIGHS = {pollutant: [band[1] for band in bands] for pollutant, bands in POLLUTANT_BREAKPOINTS.items()}
+# (DataFrame column, POLLUTANT_BREAKPOINTS key) pairs.
+_POLLUTANT_COLUMNS = (('PM2.5', 'pm25'), ('PM10', 'pm10'), ('NO2', 'no2'), ('O3', 'o3'), ('CO', 'co'), ('SO2', 'so2'), ('NH3', 'nh3'))
+
 def calculate_sub_index(value, pollutant):
     """Calculates the AQI sub-index for a single pollutant value."""
     if pd.isna(value):
         return None
-    breakpoints = POLLUTANT_BREAKPOINTS.get(pollutant.lower())
+    pollutant = pollutant.lower()
+    breakpoints = POLLUTANT_BREAKPOINTS.get(pollutant)
     if not breakpoints:
         return None
 
-    for bp_low, bp_high, aqi_low, aqi_high in breakpoints:
+    # Bands ascend without overlap, so the only candidate is the first one whose upper bound is >= value.
+    band = bisect_left(_BAND_HIGHS[pollutant], value)
+    if band == len(breakpoints):
+        return None
+    bp_low, bp_high, aqi_low, aqi_high = breakpoints[band]
+    if value < bp_low:
+        return None
+    sub_index = ((aqi_high - aqi_low) / (bp_high - bp_low)) * (value - bp_low) + aqi_low
+    return round(sub_index)
+
+def _sub_index_kernel(value, bands):
+    """Linear scan of one pollutant's (bp_low, bp_high, aqi_low, aqi_high) rows; NaN if no band matches."""
+    for i in range(bands.shape[0]):
+        bp_low, bp_high, aqi_low, aqi_high = bands[i, 0], bands[i, 1], bands[i, 2], bands[i, 3]
         if bp_low <= value <= bp_high:
-            sub_index = ((aqi_high - aqi_low) / (bp_high - bp_low)) * (value - bp_low) + aqi_low
-            return round(sub_index)
-    return None 
+            # np.round rounds half to even, like the round() in calculate_sub_index.
+            return np.round((aqi_high - aqi_low) / (bp_high - bp_low) * (value - bp_low) + aqi_low)
+    return np.nan
+
+if HAS_NUMBA:
+    # fastmath stays off so the interpolation rounds exactly like the Python path.
+    _sub_index_jit = numba.njit(cache=True, fastmath=False)(_sub_index_kernel)
+
+    def calculate_sub_index_fast(value, pollutant):
+        """
+        Numba-compiled equivalent of `calculate_sub_index`, for tight per-value loops.
+
+        Falls back to `calculate_sub_index` itself when Numba is not installed.
+        """
+        if pd.isna(value):
+            return None
+        pol_idx = _POLLUTANT_INDEX.get(pollutant.lower())
+        if pol_idx is None:
+            return None
+        sub_index = _sub_index_jit(float(value), _BP_MATRIX[pol_idx])
+        return None if np.isnan(sub_index) else int(sub_index)
+else:
+    calculate_sub_index_fast = calculate_sub_index
 
 def calculate_aqi_from_pollutants(data_row):
     """
     Calculates the final AQI for a row of data by taking the max of all sub-indices.
+
+    For a whole DataFrame, use `calculate_aqi_series(df)` rather than
+    `df.apply(calculate_aqi_from_pollutants, axis=1)`; it gives the same values
+    without building a Series per row.
     """
     sub_indices = []
-    pollutant_map = {'PM2.5': 'pm25', 'PM10': 'pm10', 'NO2': 'no2', 'O3': 'o3', 'CO': 'co', 'SO2': 'so2', 'NH3': 'nh3'}
+    append_sub_index = sub_indices.append
     
-    for df_col, pol_key in pollutant_map.items():
+    for df_col, pol_key in _POLLUTANT_COLUMNS:
         if df_col in data_row:
             sub_index = calculate_sub_index(data_row[df_col], pol_key)
             if sub_index is not None:
-                sub_indices.append(sub_index)
+                append_sub_index(sub_index)
 
     if not sub_indices:
         return None
     
-    return max(sub_indices)
\ No newline at end of file
+    return max(sub_indices)
+
+def calculate_sub_index_array(values, pollutant):
+    """
+    Calculates AQI sub-indices for an array of values of one pollutant.
+
+    The vectorized counterpart of `calculate_sub_index`: each value's band is
+    found with a binary search on the band upper bounds, then interpolated.
+
+    Args:
+        values (array-like): Pollutant concentrations.
+        pollutant (str): A POLLUTANT_BREAKPOINTS key (e.g., 'pm25').
+
+    Returns:
+        np.ndarray: Rounded float sub-indices; NaN where `calculate_sub_index`
+            returns None (missing values, negatives, or gaps between bands).
+    """
+    bp_low, bp_high, aqi_low, aqi_high = _BREAKPOINT_ARRAYS[pollutant.lower()]
+    values = np.asarray(values, dtype=float)
+    idx = np.searchsorted(bp_high, values, side='left').clip(0, len(bp_high) - 1)
+    lo, hi = bp_low[idx], bp_high[idx]
+    with np.errstate(invalid='ignore'):
+        sub_index = (aqi_high[idx] - aqi_low[idx]) / (hi - lo) * (values - lo) + aqi_low[idx]
+        in_band = (values >= lo) & (values <= hi)
+    return np.where(in_band, np.round(sub_index), np.nan)
+
+def calculate_aqi_dataframe(df):
+    """
+    Calculates sub-indices and the final AQI for every row of a DataFrame at once.
+
+    Gives the same values as applying `calculate_aqi_from_pollutants` row by
+    row, without the per-row Python overhead.
+
+    Args:
+        df (pd.DataFrame): Pollutant columns named as in the dataset
+            ('PM2.5', 'PM10', 'NO2', 'O3', 'CO', 'SO2', 'NH3'); any may be absent.
+
+    Returns:
+        pd.DataFrame: One sub-index column per pollutant present (named by its
+            POLLUTANT_BREAKPOINTS key) and 'AQI', the row-wise maximum. All are
+            float, NaN where no value applies. Shares `df`'s index.
+    """
+    sub_indices = {
+        pol_key: calculate_sub_index_array(pd.to_numeric(df[df_col], errors='coerce'), pol_key)
+        for df_col, pol_key in _POLLUTANT_COLUMNS if df_col in df.columns
+    }
+    result = pd.DataFrame(sub_indices, index=df.index)
+    # fmax skips NaN like nanmax, but yields NaN for all-NaN rows without a warning.
+    result['AQI'] = np.fmax.reduce(result.to_numpy(), axis=1) if sub_indices else np.nan
+    return result
+
+def calculate_aqi_series(df):
+    """
+    Calculates the final AQI of every row of a DataFrame.
+
+    The fast path for bulk scoring: equivalent to
+    `df.apply(calculate_aqi_from_pollutants, axis=1)`, computed column-wise.
+
+    Args:
+        df (pd.DataFrame): Pollutant columns as for `calculate_aqi_dataframe`.
+
+    Returns:
+        pd.Series: Nullable Int64 AQI per row (<NA> where no sub-index applies), on `df`'s index.
+    """
+    return calculate_aqi_dataframe(df)['AQI'].astype('Int64').rename(None)
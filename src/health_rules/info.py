@@ -9,6 +9,9 @@ to classify a numerical AQI value into its corresponding category.
 """
 
 import logging 
+from bisect import bisect_left
+
+import numpy as np
 import pandas as pd
 
 
@@ -31,6 +34,14 @@ AQI_SCALE = [
     {"range": "401-500", "level": "Severe", "color": "#800000", "implications": "Affects healthy people and seriously impacts those with existing diseases. May cause respiratory impact even on light physical activity."}
 ]
 
+# Upper bound of each AQI_SCALE range, parsed once. The ranges are contiguous and
+# ascending, so the first range whose upper bound is >= a (rounded) value is its
+# category; values above the last bound fall into the last category.
+_AQI_HIGHS_LIST = [int(category['range'].split('-')[1]) for category in AQI_SCALE]
+_AQI_HIGHS = np.array(_AQI_HIGHS_LIST)
+# AQI_SCALE plus a trailing None, picked by index -1 for invalid values in get_aqi_info_many.
+_AQI_CATEGORIES = np.array(AQI_SCALE + [None], dtype=object)
+
 
 def get_aqi_info(aqi_value):
     """
@@ -47,23 +58,29 @@ def get_aqi_info(aqi_value):
 
     aqi_value = int(aqi_value + 0.5)
     
-    # 2. Find the matching category in the defined scale.
-    for category in AQI_SCALE:
-        try:
-            if '-' in category['range']:
-                low, high = map(int, category['range'].split('-'))
-                if low <= aqi_value <= high:
-                    return category
-        except ValueError:
-            log.error(f"Could not parse AQI range string: {category['range']}")
-            continue
-
-    # 3. Handle cases where the AQI value is above the highest defined range.
-    if AQI_SCALE:
-        return AQI_SCALE[-1]
-
-    log.error("AQI_SCALE constant is empty. Cannot classify value.")
-    return None
+    # 2. Find the matching category; values above the highest range map to the last one.
+    if not AQI_SCALE:
+        log.error("AQI_SCALE constant is empty. Cannot classify value.")
+        return None
+    return AQI_SCALE[min(bisect_left(_AQI_HIGHS_LIST, aqi_value), len(AQI_SCALE) - 1)]
+
+
+def get_aqi_info_many(aqi_values):
+    """
+    Finds the CPCB AQI category details for many AQI values in one vectorized pass.
+
+    Args:
+        aqi_values (array-like): Numerical AQI values (e.g., a DataFrame column).
+
+    Returns:
+        np.ndarray: Object array of AQI_SCALE entries aligned with the input,
+            with None for missing, non-numeric or negative values. Numeric
+            strings are parsed rather than rejected as in `get_aqi_info`.
+    """
+    values = pd.to_numeric(pd.Series(aqi_values), errors='coerce').to_numpy(dtype=float)
+    idx = np.searchsorted(_AQI_HIGHS, np.floor(values + 0.5)).clip(max=len(AQI_SCALE) - 1)
+    idx[np.isnan(values) | (values < 0)] = -1
+    return _AQI_CATEGORIES[idx]
 
 
 # --- Example Usage / Direct Execution ---
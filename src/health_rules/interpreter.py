@@ -11,48 +11,103 @@ risk advisories.
 """
 
 import logging 
+import sys
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+
+# Numba is optional: without it, _match_indices uses the NumPy comparison.
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 log = logging.getLogger(__name__)
 
 # --- Pollutant Health Risk Thresholds ---
-POLLUTANT_HEALTH_THRESHOLDS = {
-    "pm25": [ # PM2.5 (µg/m³)
-        {"threshold": 251, "risk": "Serious respiratory impact on healthy people. Serious aggravation of heart or lung disease.", "severity": "Severe"},
-        {"threshold": 121, "risk": "Respiratory illness on prolonged exposure. Effect may be pronounced in people with heart/lung diseases.", "severity": "Very Poor"},
-        {"threshold": 91,  "risk": "Breathing discomfort to people on prolonged exposure, and discomfort to people with heart disease.", "severity": "Poor"},
-        {"threshold": 61,  "risk": "Breathing discomfort to people with lung disease (e.g., asthma) and heart disease, children, older adults.", "severity": "Moderate"},
-    ],
-    "pm10": [ # PM10 (µg/m³)
-        {"threshold": 431, "risk": "Serious respiratory impact on healthy people. Serious aggravation of heart or lung disease.", "severity": "Severe"},
-        {"threshold": 351, "risk": "Respiratory illness on prolonged exposure. Effect may be pronounced in people with heart/lung diseases.", "severity": "Very Poor"},
-        {"threshold": 251, "risk": "Breathing discomfort to people on prolonged exposure, and discomfort to people with heart disease.", "severity": "Poor"},
-        {"threshold": 101, "risk": "Breathing discomfort to people with lung disease (e.g., asthma) and heart disease, children, older adults.", "severity": "Moderate"},
-    ],
-    "o3": [ # Ozone (µg/m³)
-        {"threshold": 749, "risk": "Serious respiratory impact on healthy people. Serious aggravation of heart or lung disease.", "severity": "Severe"},
-        {"threshold": 209, "risk": "Respiratory illness on prolonged exposure. Effect may be pronounced in people with heart/lung diseases.", "severity": "Very Poor"},
-        {"threshold": 169, "risk": "Breathing discomfort to people on prolonged exposure, and discomfort to people with heart disease.", "severity": "Poor"},
-        {"threshold": 101, "risk": "Breathing discomfort to people with lung disease (e.g., asthma) and heart disease, children, older adults.", "severity": "Moderate"},
-    ],
-    "no2": [ # Nitrogen Dioxide (µg/m³)
-        {"threshold": 401, "risk": "Serious respiratory impact on healthy people. Serious aggravation of heart or lung disease.", "severity": "Severe"},
-        {"threshold": 281, "risk": "Respiratory illness on prolonged exposure. Effect may be pronounced in people with heart/lung diseases.", "severity": "Very Poor"},
-        {"threshold": 181, "risk": "Breathing discomfort to people on prolonged exposure, and discomfort to people with heart disease.", "severity": "Poor"},
-        {"threshold": 81,  "risk": "Breathing discomfort to people with lung disease (e.g., asthma) and heart disease, children, older adults.", "severity": "Moderate"},
-    ],
-    "so2": [ # Sulfur Dioxide (µg/m³)
-        {"threshold": 1601, "risk": "Serious respiratory impact on healthy people. Serious aggravation of heart or lung disease.", "severity": "Severe"},
-        {"threshold": 801, "risk": "Respiratory illness on prolonged exposure. Effect may be pronounced in people with heart/lung diseases.", "severity": "Very Poor"},
-        {"threshold": 381, "risk": "Breathing discomfort to people on prolonged exposure, and discomfort to people with heart disease.", "severity": "Poor"},
-        {"threshold": 81,  "risk": "Breathing discomfort to people with lung disease (e.g., asthma) and heart disease, children, older adults.", "severity": "Moderate"},
-    ],
-    "co": [ # Carbon Monoxide (mg/m³)
-        {"threshold": 34.1, "risk": "Serious aggravation of heart or lung disease; may cause respiratory effects even during light activity.", "severity": "Severe"},
-        {"threshold": 17.1, "risk": "Respiratory illness on prolonged exposure. Effect may be pronounced in people with heart/lung diseases.", "severity": "Very Poor"},
-        {"threshold": 10.1, "risk": "Breathing discomfort to people on prolonged exposure, and discomfort to people with heart disease.", "severity": "Poor"},
-        {"threshold": 2.1,  "risk": "Breathing discomfort to people with lung disease (e.g., asthma) and heart disease, children, older adults.", "severity": "Moderate"},
-    ]
+# Advisory wording shared by every pollutant at a given severity.
+_RISK_BY_SEVERITY = {
+    "Severe": sys.intern("Serious respiratory impact on healthy people. Serious aggravation of heart or lung disease."),
+    "Very Poor": sys.intern("Respiratory illness on prolonged exposure. Effect may be pronounced in people with heart/lung diseases."),
+    "Poor": sys.intern("Breathing discomfort to people on prolonged exposure, and discomfort to people with heart disease."),
+    "Moderate": sys.intern("Breathing discomfort to people with lung disease (e.g., asthma) and heart disease, children, older adults."),
+}
+# (pollutant, severity) pairs whose wording differs from _RISK_BY_SEVERITY.
+_RISK_OVERRIDES = {
+    ("co", "Severe"): sys.intern("Serious aggravation of heart or lung disease; may cause respiratory effects even during light activity."),
+}
+# (threshold, severity) ladders. Invariant: each is written highest threshold first, and
+# every lookup table below is derived from that order; it is checked once here instead of sorting.
+_RAW_THRESHOLDS = {
+    "pm25": [(251, "Severe"), (121, "Very Poor"), (91, "Poor"), (61, "Moderate")],      # PM2.5 (µg/m³)
+    "pm10": [(431, "Severe"), (351, "Very Poor"), (251, "Poor"), (101, "Moderate")],    # PM10 (µg/m³)
+    "o3": [(749, "Severe"), (209, "Very Poor"), (169, "Poor"), (101, "Moderate")],      # Ozone (µg/m³)
+    "no2": [(401, "Severe"), (281, "Very Poor"), (181, "Poor"), (81, "Moderate")],      # Nitrogen Dioxide (µg/m³)
+    "so2": [(1601, "Severe"), (801, "Very Poor"), (381, "Poor"), (81, "Moderate")],     # Sulfur Dioxide (µg/m³)
+    "co": [(34.1, "Severe"), (17.1, "Very Poor"), (10.1, "Poor"), (2.1, "Moderate")],   # Carbon Monoxide (mg/m³)
+}
+for _pollutant, _levels in _RAW_THRESHOLDS.items():
+    if any(higher[0] <= lower[0] for higher, lower in zip(_levels, _levels[1:])):
+        raise ValueError(f"Health thresholds for '{_pollutant}' must be listed in descending order.")
+ThresholdLevel = namedtuple("ThresholdLevel", ("threshold", "severity", "risk"))
+# Read-only view: pollutant -> ThresholdLevel rows, highest threshold first.
+POLLUTANT_HEALTH_THRESHOLDS = MappingProxyType({
+    pollutant: tuple(
+        ThresholdLevel(threshold, severity, _RISK_OVERRIDES.get((pollutant, severity), _RISK_BY_SEVERITY[severity]))
+        for threshold, severity in levels
+    )
+    for pollutant, levels in _RAW_THRESHOLDS.items()
+})
+# The finished advisory for every level, in the same order as POLLUTANT_HEALTH_THRESHOLDS.
+_ADVISORIES = {
+    pollutant: tuple(f"{pollutant.upper()} ({level.severity}): {level.risk}" for level in levels)
+    for pollutant, levels in POLLUTANT_HEALTH_THRESHOLDS.items()
 }
+# Ascending threshold lists with parallel advisories, for bisect lookups.
+_SORTED = {
+    pollutant: (
+        [level.threshold for level in reversed(levels)],
+        _ADVISORIES[pollutant][::-1],
+    )
+    for pollutant, levels in POLLUTANT_HEALTH_THRESHOLDS.items()
+}
+# Lowest threshold per pollutant: readings below it (or NaN) trigger nothing.
+_MIN_THRESH = {pollutant: thresholds[0] for pollutant, (thresholds, _) in _SORTED.items()}
+# Ascending NumPy threshold arrays for classifying whole columns of readings.
+_THRESH = {
+    pollutant: np.array([level.threshold for level in reversed(levels)], dtype=np.float64)
+    for pollutant, levels in POLLUTANT_HEALTH_THRESHOLDS.items()
+}
+# Highest-first thresholds as one row per pollutant (row number in _POLLUTANT_INDEX), padded
+# with +inf so a shorter ladder never matches its padding, for batches across pollutants.
+_POLLUTANT_INDEX = {pollutant: i for i, pollutant in enumerate(POLLUTANT_HEALTH_THRESHOLDS)}
+_THRESH_MATRIX = np.full((len(POLLUTANT_HEALTH_THRESHOLDS), max(map(len, POLLUTANT_HEALTH_THRESHOLDS.values()))), np.inf)
+for _row, _levels in enumerate(POLLUTANT_HEALTH_THRESHOLDS.values()):
+    _THRESH_MATRIX[_row, :len(_levels)] = [level.threshold for level in _levels]
+
+@lru_cache(maxsize=256)
+def _advisories_for(readings):
+    """
+    Looks up the advisory for each (pollutant, value) reading.
+
+    Memoized because polling loops keep passing the same snapshot until the
+    station publishes a new hourly reading.
+
+    Args:
+        readings (tuple): (pollutant, value) pairs, each at or above the pollutant's lowest threshold.
+
+    Returns:
+        tuple[str]: One advisory per reading, in the same order.
+    """
+    advisories_found = []
+    for pollutant, value in readings:
+        thresholds, advisories = _SORTED[pollutant]
+        advisories_found.append(advisories[bisect_right(thresholds, value) - 1])
+    return tuple(advisories_found)
 
 def interpret_pollutant_risks(iaqi_data):
     """
@@ -70,38 +125,134 @@ def interpret_pollutant_risks(iaqi_data):
     Returns:
         list[str]: A list of human-readable risk advisories for any pollutant
                    exceeding a defined threshold. The format is:
-                   "{POLLUTANT} ({Severity}): {Risk Description}".
+                   "{POLLUTANT} ({Severity}): {Risk Description}", in the order of
+                   POLLUTANT_HEALTH_THRESHOLDS.
                    Returns an empty list if no thresholds are met or input is invalid.
     """
-    triggered_risks = []
     if not iaqi_data or not isinstance(iaqi_data, dict):
         log.warning("Invalid or empty iaqi_data received for interpretation.")
-        return triggered_risks
+        return []
     
-    log.info(f"Interpreting risks using CPCB-derived thresholds for iaqi data: {iaqi_data}")
+    debug = log.isEnabledFor(logging.DEBUG)
+    checked = []  # (pollutant, value) pairs, collected only for the DEBUG summary.
+    readings = []  # (pollutant, value) pairs that reach at least the lowest level.
+    # Local aliases keep the loop's lookups off the module globals and builtins.
+    lowest_threshold, to_float, append_reading = _MIN_THRESH.get, float, readings.append
+    # Walk the (usually short) input rather than the whole threshold table.
+    for pollutant, entry in iaqi_data.items():
+        lowest = lowest_threshold(pollutant)
+        if lowest is None:
+            continue
+        try:
+            raw_value = entry['v']
+        except (KeyError, TypeError):
+            continue  # No reading, or not a {'v': ...} entry at all.
+        try:
+            value = to_float(raw_value)
+        except (ValueError, TypeError) as e:
+            log.warning("Could not parse value for pollutant '%s': %s. Error: %s", pollutant, raw_value, e)
+            continue
+        if debug:
+            checked.append((pollutant, value))
+        # Most readings sit below the lowest level. The comparison is also False for NaN,
+        # which bisect would otherwise place above the highest threshold.
+        if value >= lowest:
+            append_reading((pollutant, value))
+
+    # Report in threshold-table order, as the batch path does, whatever the API's key order.
+    readings.sort(key=lambda reading: _POLLUTANT_INDEX[reading[0]])
+    triggered_risks = list(_advisories_for(tuple(readings)))
+    # One record per call (lazy %-style arguments), rather than one per pollutant checked.
+    if debug:
+        log.debug("Checked pollutant values: %s", ", ".join(f"{p.upper()}={v}" for p, v in checked))
+    if triggered_risks:
+        log.info("CPCB-derived risks for pollutants %s: %s", list(iaqi_data), triggered_risks)
+    else:
+        log.info("No significant pollutant thresholds exceeded for %s based on CPCB-derived rules.", list(iaqi_data))
+    return triggered_risks
+
+def classify_pollutant_levels(pollutant, values):
+    """
+    Finds the highest threshold level reached by each of many readings of one pollutant.
+
+    Vectorized counterpart of the per-pollutant lookup in `interpret_pollutant_risks`,
+    for whole columns of readings (e.g. historical data) rather than a single snapshot.
 
-    for pollutant, thresholds in POLLUTANT_HEALTH_THRESHOLDS.items():
-        if pollutant in iaqi_data and isinstance(iaqi_data[pollutant], dict) and 'v' in iaqi_data[pollutant]:
+    Args:
+        pollutant (str): Pollutant key, e.g. 'pm25'.
+        values (array-like): Pollutant concentrations.
+
+    Returns:
+        np.ndarray: For each value, the index into POLLUTANT_HEALTH_THRESHOLDS[pollutant]
+                    of the level reached, or -1 if none is (including NaN readings).
+    """
+    thresholds = _THRESH[pollutant]
+    values = np.asarray(values, dtype=np.float64)
+    ascending_idx = np.searchsorted(thresholds, values, side='right') - 1
+    return np.where(values >= thresholds[0], len(thresholds) - 1 - ascending_idx, -1)
+
+def _match_indices_kernel(values, thresh_matrix):
+    """Per-row scan for the first threshold column each value reaches; -1 where none is."""
+    matched = np.full(values.shape[0], -1, dtype=np.int64)
+    for i in range(values.shape[0]):
+        for j in range(thresh_matrix.shape[1]):
+            if values[i] >= thresh_matrix[i, j]:
+                matched[i] = j
+                break
+    return matched
+
+if HAS_NUMBA:
+    _match_indices = numba.njit(cache=True)(_match_indices_kernel)
+else:
+    def _match_indices(values, thresh_matrix):
+        """
+        Finds, for each value, the first column of its threshold row that the value reaches.
+
+        Args:
+            values (np.ndarray): float64 readings, shape (n,).
+            thresh_matrix (np.ndarray): Highest-first thresholds, one row per reading, shape (n, levels).
+
+        Returns:
+            np.ndarray: Matched column per reading, or -1 where none is reached.
+        """
+        mask = values[:, None] >= thresh_matrix
+        return np.where(mask.any(axis=1), mask.argmax(axis=1), -1)
+
+def interpret_pollutant_risks_many(iaqi_list):
+    """
+    Batch form of `interpret_pollutant_risks` for many iaqi snapshots.
+
+    All valid readings across all snapshots are compared against their threshold
+    rows in a single vectorized step, instead of one Python lookup per pollutant.
+
+    Args:
+        iaqi_list (list[dict | None]): iaqi dictionaries, as accepted by `interpret_pollutant_risks`.
+
+    Returns:
+        list[list[str]]: The advisories for each snapshot, in input order.
+    """
+    owners, rows, readings = [], [], []
+    for owner, iaqi_data in enumerate(iaqi_list):
+        if not iaqi_data or not isinstance(iaqi_data, dict):
+            continue
+        for pollutant, row in _POLLUTANT_INDEX.items():
             try:
-                value = float(iaqi_data[pollutant]['v'])
-                log.debug(f"Checking {pollutant.upper()} with value {value}")
-
-                highest_risk_found = None
-                for level_info in sorted(thresholds, key=lambda x: x['threshold'], reverse=True): 
-                    if value >= level_info["threshold"]:
-                        highest_risk_found = f"{pollutant.upper()} ({level_info['severity']}): {level_info['risk']}"
-                        log.info(f"Threshold exceeded for {pollutant.upper()} at value {value} (>= {level_info['threshold']}). Risk: {level_info['risk']}")
-                        break
-                if highest_risk_found:
-                    triggered_risks.append(highest_risk_found)
-            except (ValueError, TypeError) as e:
-                log.warning(f"Could not parse value for pollutant '{pollutant}': {iaqi_data[pollutant].get('v')}. Error: {e}")
+                readings.append(float(iaqi_data[pollutant]['v']))
+            except (KeyError, ValueError, TypeError):
                 continue
-        else:
-            log.debug(f"Pollutant '{pollutant}' not found or format invalid: {iaqi_data.get(pollutant)}")
-    if not triggered_risks:
-        log.info("No significant pollutant thresholds exceeded based on CPCB-derived rules.")
-    return triggered_risks
+            owners.append(owner)
+            rows.append(row)
+
+    results = [[] for _ in iaqi_list]
+    if not readings:
+        return results
+    pollutants = list(POLLUTANT_HEALTH_THRESHOLDS)
+    level_idx = _match_indices(np.array(readings, dtype=np.float64), _THRESH_MATRIX[rows])
+    for owner, row, idx in zip(owners, rows, level_idx.tolist()):
+        if idx >= 0:
+            results[owner].append(_ADVISORIES[pollutants[row]][idx])
+    log.info("Interpreted pollutant risks for %d iaqi snapshots (%d readings).", len(iaqi_list), len(readings))
+    return results
 
 # --- Example Usage / Direct Execution ---
 if __name__ == "__main__":